@@ -0,0 +1,66 @@
+"""
+Vectorized aggregations over a TradeStore's parsed columns
+Estimated buy and sell volume per group is computed with np.unique/np.bincount
+over the store's numeric amount columns instead of looping over trade dicts.
+"""
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from trade_store import BUY_ACTIONS, SELL_ACTIONS, TradeStore
+
+GROUP_FIELDS = ('ticker', 'month', 'type')
+
+
+def trade_volume(store: TradeStore, group_by: Sequence[str] = GROUP_FIELDS) -> Dict:
+    """Estimated buy/sell dollar volume (low, mid, high of the disclosed ranges) per group"""
+    columns = store.columns()
+    if not columns['ticker']:
+        return {'group_by': list(group_by), 'groups': [], 'totals': _empty_totals()}
+
+    action = np.asarray(columns['action'], dtype=object)
+    is_buy = np.isin(action, BUY_ACTIONS)
+    is_sell = np.isin(action, SELL_ACTIONS)
+    amounts = {bound: np.nan_to_num(np.asarray(columns[f'amount_{bound}'], dtype=float))
+               for bound in ('low', 'mid', 'high')}
+
+    # One integer code per distinct combination of the group-by keys
+    key_columns = [np.asarray(columns[field], dtype=object).astype(str) for field in group_by]
+    if key_columns:
+        codes = np.stack([np.unique(keys, return_inverse=True)[1] for keys in key_columns], axis=1)
+        unique_codes, group_ids = np.unique(codes, axis=0, return_inverse=True)
+        group_ids = group_ids.reshape(-1)
+        groups = len(unique_codes)
+    else:
+        group_ids = np.zeros(len(action), dtype=np.intp)
+        groups = 1
+
+    sums = {}
+    for side, mask in (('buy', is_buy), ('sell', is_sell)):
+        sums[f'{side}_count'] = np.bincount(group_ids, weights=mask.astype(float), minlength=groups)
+        for bound, values in amounts.items():
+            sums[f'{side}_{bound}'] = np.bincount(group_ids, weights=np.where(mask, values, 0.0), minlength=groups)
+
+    # First row of each group supplies its key values
+    first_rows = np.full(groups, len(group_ids), dtype=np.intp)
+    np.minimum.at(first_rows, group_ids, np.arange(len(group_ids)))
+
+    rows: List[Dict] = []
+    for group in range(groups):
+        row = {field: str(key_columns[i][first_rows[group]]) for i, field in enumerate(group_by)}
+        for name, values in sums.items():
+            row[name] = int(values[group]) if name.endswith('_count') else round(float(values[group]), 2)
+        row['net_mid'] = round(row['buy_mid'] - row['sell_mid'], 2)
+        rows.append(row)
+    rows.sort(key=lambda row: tuple(row[field] for field in group_by))
+
+    totals = {name: (int(values.sum()) if name.endswith('_count') else round(float(values.sum()), 2))
+              for name, values in sums.items()}
+    totals['net_mid'] = round(totals['buy_mid'] - totals['sell_mid'], 2)
+    return {'group_by': list(group_by), 'groups': rows, 'totals': totals}
+
+
+def _empty_totals() -> Dict:
+    totals = {f'{side}_{name}': 0 for side in ('buy', 'sell') for name in ('count', 'low', 'mid', 'high')}
+    totals['net_mid'] = 0
+    return totals
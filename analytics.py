@@ -0,0 +1,298 @@
+"""
+Vectorized portfolio analytics over aligned value series
+Series are held as read-only NumPy arrays aligned on date. Every metric is
+computed along the time axis of a 2-D (series x periods) array, so many
+profiles, or daily instead of monthly history, cost one array pass rather than
+a Python loop per point.
+
+GrowthSeries keeps a cumulative-growth prefix array per series, so the return
+over any window is growth[j] / growth[i] - 1: an O(1) lookup after an
+O(log n) search for the window's end points.
+"""
+import csv
+import os
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+PERIODS_PER_YEAR = {'daily': 252, 'weekly': 52, 'monthly': 12}
+
+
+def infer_periods_per_year(dates: Sequence[str]) -> int:
+    """12 for 'YYYY-MM' dates, otherwise from the median gap between 'YYYY-MM-DD' dates"""
+    if len(dates) < 2 or len(dates[0]) <= 7:
+        return PERIODS_PER_YEAR['monthly']
+    ordinals = np.array([datetime.strptime(d[:10], '%Y-%m-%d').toordinal() for d in dates])
+    gap = float(np.median(np.diff(ordinals)))
+    if gap <= 3:
+        return PERIODS_PER_YEAR['daily']
+    if gap <= 8:
+        return PERIODS_PER_YEAR['weekly']
+    return PERIODS_PER_YEAR['monthly']
+
+
+def date_key(text) -> Optional[int]:
+    """Date ordinal of 'YYYY-MM' (first of the month), 'YYYY-MM-DD' or 'M/D/YYYY'; None if unparseable"""
+    text = str(text).strip()
+    for fmt in ('%Y-%m-%d', '%m/%d/%Y', '%Y-%m'):
+        try:
+            return datetime.strptime(text[:10] if fmt == '%Y-%m-%d' else text, fmt).toordinal()
+        except ValueError:
+            continue
+    return None
+
+
+def _readonly(values) -> np.ndarray:
+    array = np.asarray(values, dtype=float)
+    array.flags.writeable = False
+    return array
+
+
+@dataclass(frozen=True)
+class AlignedSeries:
+    """Portfolio value series (one row per profile) and a benchmark, on the dates they share"""
+    dates: Tuple[str, ...]
+    names: Tuple[str, ...]
+    values: np.ndarray          # shape (profiles, periods)
+    benchmark: np.ndarray       # shape (periods,)
+    periods_per_year: int
+
+    @classmethod
+    def align(cls, series: Dict[str, Sequence[Dict]], benchmark: Sequence[Dict]) -> 'AlignedSeries':
+        """Build from {name: [{'date', 'value'}, ...]} and a benchmark list in the same shape"""
+        bench_by_date = {point['date']: point['value'] for point in benchmark}
+        by_name = {name: {point['date']: point['value'] for point in points} for name, points in series.items()}
+        dates = sorted(set(bench_by_date).intersection(*[set(values) for values in by_name.values()]))
+        return cls(
+            dates=tuple(dates),
+            names=tuple(by_name),
+            values=_readonly([[values[d] for d in dates] for values in by_name.values()]).reshape(len(by_name), len(dates)),
+            benchmark=_readonly([bench_by_date[d] for d in dates]),
+            periods_per_year=infer_periods_per_year(dates),
+        )
+
+
+def _returns(values: np.ndarray) -> np.ndarray:
+    """Period-over-period simple returns along the last axis"""
+    return values[..., 1:] / values[..., :-1] - 1.0
+
+
+def _drawdowns(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Max drawdown (as a negative fraction), and the peak and trough index of it, per row"""
+    running_peak = np.maximum.accumulate(values, axis=-1)
+    drawdown = values / running_peak - 1.0
+    trough = np.argmin(drawdown, axis=-1)
+    # The peak is the last running-max point at or before the trough
+    positions = np.arange(values.shape[-1])
+    at_peak = (values == running_peak) & (positions <= trough[..., None])
+    peak = values.shape[-1] - 1 - np.argmax(at_peak[..., ::-1], axis=-1)
+    return np.take_along_axis(drawdown, trough[..., None], axis=-1)[..., 0], peak, trough
+
+
+def _summary(values: np.ndarray, returns: np.ndarray, periods_per_year: int, risk_free: float) -> Dict[str, np.ndarray]:
+    years = returns.shape[-1] / periods_per_year
+    total = values[..., -1] / values[..., 0] - 1.0
+    volatility = returns.std(axis=-1, ddof=1) * np.sqrt(periods_per_year)
+    excess = returns.mean(axis=-1) * periods_per_year - risk_free
+    max_drawdown, peak, trough = _drawdowns(values)
+    return {
+        'total_return': total,
+        'annualized_return': (1.0 + total) ** (1.0 / years) - 1.0,
+        'volatility': volatility,
+        'sharpe': np.divide(excess, volatility, out=np.full_like(excess, np.nan), where=volatility > 0),
+        'max_drawdown': max_drawdown,
+        'drawdown_peak': peak,
+        'drawdown_trough': trough,
+    }
+
+
+def _round(value, digits):
+    value = float(value)
+    return None if np.isnan(value) else round(value, digits)
+
+
+def compute_analytics(aligned: AlignedSeries, window: int = 12, risk_free: float = 0.0) -> Dict:
+    """Return, risk and benchmark-relative metrics for every series in aligned.
+
+    Returns, volatility, drawdown, alpha and tracking error are percentages; risk_free
+    is an annual fraction. Rolling returns cover `window` periods.
+    """
+    ppy = aligned.periods_per_year
+    if len(aligned.dates) < 3:
+        return {'periods': len(aligned.dates), 'periods_per_year': ppy, 'profiles': {}, 'benchmark': None}
+
+    window = max(1, min(window, len(aligned.dates) - 1))
+    values, bench = aligned.values, aligned.benchmark
+    returns, bench_returns = _returns(values), _returns(bench)
+
+    stats = _summary(values, returns, ppy, risk_free)
+    bench_stats = _summary(bench[None, :], bench_returns[None, :], ppy, risk_free)
+
+    # Benchmark-relative metrics from per-period returns
+    rf_period = risk_free / ppy
+    active = returns - bench_returns
+    bench_centered = bench_returns - bench_returns.mean()
+    bench_var = (bench_centered ** 2).sum() / (len(bench_returns) - 1)
+    covariance = ((returns - returns.mean(axis=-1, keepdims=True)) * bench_centered).sum(axis=-1) / (len(bench_returns) - 1)
+    beta = covariance / bench_var if bench_var > 0 else np.full(len(values), np.nan)
+    alpha = ((returns.mean(axis=-1) - rf_period) - beta * (bench_returns.mean() - rf_period)) * ppy
+    tracking_error = active.std(axis=-1, ddof=1) * np.sqrt(ppy)
+    information_ratio = np.divide(active.mean(axis=-1) * ppy, tracking_error,
+                                  out=np.full_like(tracking_error, np.nan), where=tracking_error > 0)
+    spread = returns.std(axis=-1, ddof=1) * np.sqrt(bench_var)
+    correlation = np.divide(covariance, spread, out=np.full_like(covariance, np.nan), where=spread > 0)
+
+    rolling = values[:, window:] / values[:, :-window] - 1.0
+    bench_rolling = bench[window:] / bench[:-window] - 1.0
+    rolling_dates = aligned.dates[window:]
+
+    def describe(stat: Dict[str, np.ndarray], i: int) -> Dict:
+        return {
+            'total_return': _round(stat['total_return'][i] * 100, 2),
+            'annualized_return': _round(stat['annualized_return'][i] * 100, 2),
+            'volatility': _round(stat['volatility'][i] * 100, 2),
+            'sharpe': _round(stat['sharpe'][i], 3),
+            'max_drawdown': _round(stat['max_drawdown'][i] * 100, 2),
+            'max_drawdown_peak': aligned.dates[int(stat['drawdown_peak'][i])],
+            'max_drawdown_trough': aligned.dates[int(stat['drawdown_trough'][i])],
+        }
+
+    profiles: Dict[str, Dict] = {}
+    for i, name in enumerate(aligned.names):
+        profiles[name] = {
+            **describe(stats, i),
+            'beta': _round(beta[i], 3),
+            'alpha': _round(alpha[i] * 100, 2),
+            'tracking_error': _round(tracking_error[i] * 100, 2),
+            'information_ratio': _round(information_ratio[i], 3),
+            'correlation': _round(correlation[i], 3),
+            'rolling_returns': np.round(rolling[i] * 100, 2).tolist(),
+        }
+
+    benchmark = describe(bench_stats, 0)
+    benchmark['rolling_returns'] = np.round(bench_rolling * 100, 2).tolist()
+    return {
+        'start': aligned.dates[0],
+        'end': aligned.dates[-1],
+        'periods': len(aligned.dates),
+        'periods_per_year': ppy,
+        'window': window,
+        'risk_free_rate': risk_free,
+        'rolling_dates': list(rolling_dates),
+        'profiles': profiles,
+        'benchmark': benchmark,
+    }
+
+
+@dataclass(frozen=True)
+class GrowthSeries:
+    """A value series with its cumulative-growth prefix array, for O(1) window returns"""
+    name: str
+    points: Tuple[Dict, ...]    # the original {'date', 'value'} points, sorted by date
+    ordinals: np.ndarray
+    growth: np.ndarray          # growth[i] = product of (1 + r_k) for k <= i; growth[0] == 1
+
+    @classmethod
+    def from_points(cls, name: str, points: Sequence[Dict]) -> 'GrowthSeries':
+        keyed = [(date_key(p['date']), p) for p in points if p.get('value')]
+        keyed = sorted(((ordinal, p) for ordinal, p in keyed if ordinal is not None), key=lambda item: item[0])
+        values = np.array([float(p['value']) for _, p in keyed])
+        period_growth = values[1:] / values[:-1] if len(values) > 1 else np.array([])
+        return cls(
+            name=name,
+            points=tuple(p for _, p in keyed),
+            ordinals=_readonly([ordinal for ordinal, _ in keyed]),
+            growth=_readonly(np.concatenate([[1.0], np.cumprod(period_growth)]) if len(values) else []),
+        )
+
+    def index_range(self, start: Optional[int] = None, end: Optional[int] = None) -> Optional[Tuple[int, int]]:
+        """(i, j) of the first point on/after start and the last on/before end, or None if empty"""
+        i = int(np.searchsorted(self.ordinals, start, side='left')) if start is not None else 0
+        j = int(np.searchsorted(self.ordinals, end, side='right')) - 1 if end is not None else len(self.ordinals) - 1
+        return (i, j) if 0 <= i <= j < len(self.ordinals) else None
+
+    def window_return(self, i: int, j: int) -> float:
+        return float(self.growth[j] / self.growth[i] - 1.0)
+
+    def as_of(self, ordinals: np.ndarray) -> np.ndarray:
+        """Index of the last point on or before each ordinal (the first point for ordinals before it)"""
+        return np.clip(np.searchsorted(self.ordinals, ordinals, side='right') - 1, 0, None)
+
+    def rebased(self, indexes: np.ndarray, dates: Sequence[str], start_value: float) -> List[Dict]:
+        """Values at indexes rescaled so the first equals start_value, labelled with dates,
+        for charting on another series' axis"""
+        growth = self.growth[indexes] / self.growth[indexes[0]] * start_value
+        return [{'date': d, 'value': round(float(v))} for d, v in zip(dates, growth)]
+
+
+def load_benchmark_csvs(directory: str) -> Dict[str, GrowthSeries]:
+    """One GrowthSeries per <name>.csv with a date column and a value/close/adj close column"""
+    series: Dict[str, GrowthSeries] = {}
+    if not os.path.isdir(directory):
+        return series
+    for filename in sorted(os.listdir(directory)):
+        name, ext = os.path.splitext(filename)
+        if ext.lower() != '.csv':
+            continue
+        try:
+            with open(os.path.join(directory, filename), newline='') as f:
+                reader = csv.DictReader(f)
+                columns = {column.strip().lower(): column for column in reader.fieldnames or []}
+                value_column = next((columns[c] for c in ('value', 'adj close', 'close') if c in columns), None)
+                if 'date' not in columns or value_column is None:
+                    print(f"Skipping benchmark {filename}: needs date and value/close columns", flush=True)
+                    continue
+                points = [{'date': row[columns['date']].strip(), 'value': float(row[value_column])}
+                          for row in reader if row.get(value_column) not in (None, '', 'null')]
+            loaded = GrowthSeries.from_points(name, points)
+            if len(loaded.points) >= 2:
+                series[name.lower()] = loaded
+                print(f"Loaded benchmark {name} ({len(loaded.points)} points)", flush=True)
+        except Exception as e:
+            print(f"Error loading benchmark {filename}: {e}", flush=True)
+    return series
+
+
+def month_label(text: str) -> str:
+    """'2022-05' / '2022-05-31' -> 'May 2022'"""
+    ordinal = date_key(text)
+    return date.fromordinal(ordinal).strftime('%B %Y') if ordinal is not None else str(text)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indices kept by Largest-Triangle-Three-Buckets downsampling to `threshold` points.
+    Always keeps the first and last point; returns every index when no reduction is needed."""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n) if threshold >= n else np.array([0, n - 1][:max(threshold, 0)], dtype=np.intp)
+
+    # Interior points split into threshold - 2 buckets of (nearly) equal size
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    kept = np.empty(threshold, dtype=np.intp)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for b in range(threshold - 2):
+        start, stop = edges[b], max(edges[b + 1], edges[b] + 1)
+        # Third vertex: mean of the next bucket (or the last point for the final bucket)
+        if b + 2 < len(edges):
+            next_start, next_stop = edges[b + 1], max(edges[b + 2], edges[b + 1] + 1)
+            avg_x, avg_y = x[next_start:next_stop].mean(), y[next_start:next_stop].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        area = np.abs((x[previous] - avg_x) * (y[start:stop] - y[previous])
+                      - (x[previous] - x[start:stop]) * (avg_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        kept[b + 1] = previous
+    return kept
+
+
+def downsample_points(points: Sequence[Dict], threshold: int, value_key: str = 'value') -> List[Dict]:
+    """LTTB-downsampled copy of [{'date', value_key}] points, in date order"""
+    if threshold >= len(points):
+        return list(points)
+    ordinals = [date_key(p.get('date')) for p in points]
+    x = np.array(ordinals if None not in ordinals else range(len(points)), dtype=float)
+    y = np.array([float(p.get(value_key) or 0) for p in points])
+    return [points[i] for i in lttb_indices(x, y, threshold)]
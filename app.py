@@ -1,6 +1,23 @@
-from flask import Flask, render_template, jsonify
+from flask import Flask, Response, render_template, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+from markupsafe import Markup
 from datetime import datetime
+from types import MappingProxyType
+import math
+import os
 import sys
+import threading
+import time
+
+from aggregations import GROUP_FIELDS, trade_volume
+from analytics import (AlignedSeries, GrowthSeries, compute_analytics, date_key, downsample_points,
+                       load_benchmark_csvs, lttb_indices, month_label)
+from options_exposure import DEFAULT_RISK_FREE_RATE, DEFAULT_VOLATILITY, options_exposure
+from refresher import PortfolioRefresher
+from snapshots import per_version, portfolio_delta, project, reference_table
+from trade_store import date_ordinal, decode_cursor, encode_cursor
+from response_cache import ResponseCache, conditional_response, send_static_compressed
+from scraper import PelosiTrackerScraper
 
 print("Imports loaded", flush=True)
 
@@ -263,7 +280,17 @@ NANCY_QUOTES = [
     }
 ]
 
+class JSONProvider(DefaultJSONProvider):
+    """Encodes the read-only reference tables and snapshots like ordinary dicts"""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, MappingProxyType):
+            return dict(o)
+        return DefaultJSONProvider.default(o)
+
 app = Flask(__name__)
+app.json = JSONProvider(app)
 
 print("Flask app created with REAL Nancy Pelosi data", flush=True)
 
@@ -294,280 +321,759 @@ portfolio_data = {
     'last_updated': datetime.now().isoformat()
 }
 
+# Mock data for other profiles (using similar structure to Nancy); 'nancy' comes from the live snapshot
+PROFILE_PORTFOLIOS = reference_table({
+    'rick-scott': {
+        'holdings': [
+            {'ticker': 'AAPL', 'last_price': 250.35, 'price_display': '$250.35', 'weight': 22.0, 'weight_display': '22%'},
+            {'ticker': 'MSFT', 'last_price': 445.20, 'price_display': '$445.20', 'weight': 18.0, 'weight_display': '18%'},
+            {'ticker': 'GOOGL', 'last_price': 189.50, 'price_display': '$189.50', 'weight': 15.0, 'weight_display': '15%'},
+            {'ticker': 'AMZN', 'last_price': 230.75, 'price_display': '$230.75', 'weight': 12.0, 'weight_display': '12%'},
+            {'ticker': 'TSLA', 'last_price': 412.80, 'price_display': '$412.80', 'weight': 10.0, 'weight_display': '10%'},
+        ],
+        'performance': {
+            'performance_percent': 28.5,
+            'total_invested': 95000000
+        },
+        'stats': {
+            'holdings_count': 8,
+            'copiers': 8234
+        }
+    },
+    'tommy-tuberville': {
+        'holdings': [
+            {'ticker': 'NVDA', 'last_price': 145.89, 'price_display': '$145.89', 'weight': 25.0, 'weight_display': '25%'},
+            {'ticker': 'AMD', 'last_price': 125.30, 'price_display': '$125.30', 'weight': 20.0, 'weight_display': '20%'},
+            {'ticker': 'AAPL', 'last_price': 250.35, 'price_display': '$250.35', 'weight': 15.0, 'weight_display': '15%'},
+            {'ticker': 'MSFT', 'last_price': 445.20, 'price_display': '$445.20', 'weight': 12.0, 'weight_display': '12%'},
+        ],
+        'performance': {
+            'performance_percent': 32.0,
+            'total_invested': 72000000
+        },
+        'stats': {
+            'holdings_count': 6,
+            'copiers': 5123
+        }
+    },
+    'josh-gottheimer': {
+        'holdings': [
+            {'ticker': 'GOOGL', 'last_price': 189.50, 'price_display': '$189.50', 'weight': 20.0, 'weight_display': '20%'},
+            {'ticker': 'META', 'last_price': 638.25, 'price_display': '$638.25', 'weight': 18.0, 'weight_display': '18%'},
+            {'ticker': 'AAPL', 'last_price': 250.35, 'price_display': '$250.35', 'weight': 15.0, 'weight_display': '15%'},
+            {'ticker': 'MSFT', 'last_price': 445.20, 'price_display': '$445.20', 'weight': 14.0, 'weight_display': '14%'},
+        ],
+        'performance': {
+            'performance_percent': 25.8,
+            'total_invested': 68000000
+        },
+        'stats': {
+            'holdings_count': 7,
+            'copiers': 4567
+        }
+    },
+    'dan-crenshaw': {
+        'holdings': [
+            {'ticker': 'NVDA', 'last_price': 145.89, 'price_display': '$145.89', 'weight': 28.0, 'weight_display': '28%'},
+            {'ticker': 'TSLA', 'last_price': 412.80, 'price_display': '$412.80', 'weight': 22.0, 'weight_display': '22%'},
+            {'ticker': 'AAPL', 'last_price': 250.35, 'price_display': '$250.35', 'weight': 16.0, 'weight_display': '16%'},
+        ],
+        'performance': {
+            'performance_percent': 35.2,
+            'total_invested': 85000000
+        },
+        'stats': {
+            'holdings_count': 5,
+            'copiers': 6789
+        }
+    },
+    'markwayne-mullin': {
+        'holdings': [
+            {'ticker': 'XOM', 'last_price': 112.45, 'price_display': '$112.45', 'weight': 30.0, 'weight_display': '30%'},
+            {'ticker': 'CVX', 'last_price': 145.20, 'price_display': '$145.20', 'weight': 25.0, 'weight_display': '25%'},
+            {'ticker': 'AAPL', 'last_price': 250.35, 'price_display': '$250.35', 'weight': 15.0, 'weight_display': '15%'},
+        ],
+        'performance': {
+            'performance_percent': 18.5,
+            'total_invested': 55000000
+        },
+        'stats': {
+            'holdings_count': 6,
+            'copiers': 3456
+        }
+    },
+    'eric-trump': {
+        'holdings': [
+            {'ticker': 'DJT', 'last_price': 45.20, 'price_display': '$45.20', 'weight': 35.0, 'weight_display': '35%'},
+            {'ticker': 'AAPL', 'last_price': 250.35, 'price_display': '$250.35', 'weight': 20.0, 'weight_display': '20%'},
+            {'ticker': 'MSFT', 'last_price': 445.20, 'price_display': '$445.20', 'weight': 15.0, 'weight_display': '15%'},
+        ],
+        'performance': {
+            'performance_percent': 22.3,
+            'total_invested': 42000000
+        },
+        'stats': {
+            'holdings_count': 4,
+            'copiers': 2890
+        }
+    }
+})
+
+# Profile information for the locked coming-soon pages
+PROFILES_INFO = reference_table({
+    'rick-scott': {
+        'name': 'Rick Scott',
+        'title': 'Senator, Florida',
+        'party': 'Republican',
+        'badge_class': 'badge-red',
+        'district': 'Florida',
+        'role': 'Senator',
+        'years_in_office': '2019 - Present',
+        'age': '71 years',
+        'committees_link': 'https://www.scott.senate.gov/',
+        'biography': 'Richard Lynn Scott is an American businessman and politician serving as the junior United States Senator from Florida since 2019. A member of the Republican Party, he previously served as the 45th governor of Florida from 2011 to 2019. Before entering politics, Scott was a healthcare executive and co-founder of Columbia Hospital Corporation.',
+        'filing_stats': {
+            'avg_reporting_time': 28,
+            'avg_filing_frequency': 62,
+            'time_since_last_filing': 45
+        },
+        'image_url': 'https://static.wixstatic.com/media/e2da02_6ce3f0fedeac4311982ea028e517202b~mv2.png'
+    },
+    'tommy-tuberville': {
+        'name': 'Tommy Tuberville',
+        'title': 'Senator, Alabama',
+        'party': 'Republican',
+        'badge_class': 'badge-red',
+        'district': 'Alabama',
+        'role': 'Senator',
+        'years_in_office': '2021 - Present',
+        'age': '69 years',
+        'committees_link': 'https://www.tuberville.senate.gov/',
+        'biography': 'Thomas Hawley Tuberville is an American politician and former college football coach serving as the junior United States Senator from Alabama since 2021. A member of the Republican Party, he previously coached college football for over 40 years, including head coaching positions at Auburn University, Texas Tech University, and the University of Cincinnati.',
+        'filing_stats': {
+            'avg_reporting_time': 31,
+            'avg_filing_frequency': 68,
+            'time_since_last_filing': 52
+        },
+        'image_url': 'https://static.wixstatic.com/media/e2da02_1873027f391c40d3a890751b381b64a1~mv2.png'
+    },
+    'josh-gottheimer': {
+        'name': 'Josh Gottheimer',
+        'title': 'Representative, New Jersey',
+        'party': 'Democrat',
+        'badge_class': 'badge-blue',
+        'district': 'District 5',
+        'role': 'Representative',
+        'years_in_office': '2017 - Present',
+        'age': '49 years',
+        'committees_link': 'https://gottheimer.house.gov/',
+        'biography': 'Joshua Gottheimer is an American politician serving as the U.S. Representative for New Jersey\'s 5th congressional district since 2017. A member of the Democratic Party, he previously worked as a speechwriter for President Bill Clinton and as a corporate attorney. Gottheimer is a member of the Problem Solvers Caucus and focuses on bipartisan solutions.',
+        'filing_stats': {
+            'avg_reporting_time': 26,
+            'avg_filing_frequency': 58,
+            'time_since_last_filing': 41
+        },
+        'image_url': 'https://static.wixstatic.com/media/e2da02_e31408565d714a04a9c2cc567586ac86~mv2.png'
+    },
+    'dan-crenshaw': {
+        'name': 'Dan Crenshaw',
+        'title': 'Representative, Texas',
+        'party': 'Republican',
+        'badge_class': 'badge-red',
+        'district': 'District 2',
+        'role': 'Representative',
+        'years_in_office': '2019 - Present',
+        'age': '40 years',
+        'committees_link': 'https://crenshaw.house.gov/',
+        'biography': 'Daniel Reed Crenshaw is an American politician and former Navy SEAL serving as the U.S. Representative for Texas\'s 2nd congressional district since 2019. A member of the Republican Party, he served as a Navy SEAL officer for 10 years, completing multiple deployments to Iraq and Afghanistan. He lost his right eye in an IED explosion in Afghanistan in 2012.',
+        'filing_stats': {
+            'avg_reporting_time': 29,
+            'avg_filing_frequency': 64,
+            'time_since_last_filing': 48
+        },
+        'image_url': 'https://static.wixstatic.com/media/e2da02_92039f4752cc427682ca9650cb0799c9~mv2.png'
+    },
+    'markwayne-mullin': {
+        'name': 'Markwayne Mullin',
+        'title': 'Senator, Oklahoma',
+        'party': 'Republican',
+        'badge_class': 'badge-red',
+        'district': 'Oklahoma',
+        'role': 'Senator',
+        'years_in_office': '2023 - Present',
+        'age': '46 years',
+        'committees_link': 'https://www.mullin.senate.gov/',
+        'biography': 'Markwayne Mullin is an American businessman and politician serving as the junior United States Senator from Oklahoma since 2023. A member of the Republican Party, he previously served as the U.S. Representative for Oklahoma\'s 2nd congressional district from 2013 to 2023. Before entering politics, Mullin owned and operated a plumbing business.',
+        'filing_stats': {
+            'avg_reporting_time': 33,
+            'avg_filing_frequency': 71,
+            'time_since_last_filing': 55
+        },
+        'image_url': 'https://static.wixstatic.com/media/e2da02_7f5176bc04474974940b201de37151ec~mv2.png'
+    },
+    'eric-trump': {
+        'name': 'Eric Trump',
+        'title': 'Businessman, New York',
+        'party': 'Republican',
+        'badge_class': 'badge-red',
+        'district': 'New York',
+        'role': 'Businessman',
+        'years_in_office': 'N/A',
+        'age': '40 years',
+        'committees_link': None,
+        'biography': 'Eric Frederick Trump is an American businessman and the executive vice president of the Trump Organization. He is the third child of former President Donald Trump and his first wife, Ivana Trump. Eric has been involved in the family real estate business since a young age and currently oversees the company\'s development and acquisition operations.',
+        'filing_stats': {
+            'avg_reporting_time': None,
+            'avg_filing_frequency': None,
+            'time_since_last_filing': None
+        },
+        'image_url': 'https://static.wixstatic.com/media/e2da02_de23f5c5eba9443587397fa27db0580c~mv2.png'
+    }
+})
+
+DEFAULT_PROFILE_INFO = reference_table({
+    'name': 'Profile',
+    'title': 'Coming Soon',
+    'party': 'Unknown',
+    'badge_class': 'badge-gray',
+    'district': 'TBA',
+    'role': 'TBA',
+    'years_in_office': 'TBA',
+    'age': 'TBA',
+    'committees_link': None,
+    'biography': 'Biography information coming soon.'
+})
+
+# Stock-specific data for /api/stock/<ticker>
+STOCK_INFO = reference_table({
+    'NVDA': {
+        'company_name': 'NVIDIA Corporation',
+        'description': 'Leading AI chip manufacturer. Nancy Pelosi has been actively trading NVDA, including a major sale of 10,000 shares on 12/31/2024 and exercising call options.',
+        'week_range_low': 108.13,
+        'week_range_high': 152.89,
+        'price_change': -2.45,
+        'price_change_percent': -1.65,
+        'similar_stocks': [
+            {'ticker': 'AMD', 'name': 'Advanced Micro Devices', 'price': 125.30, 'change': -1.20, 'change_percent': -0.95, 'reason': 'Semiconductor competitor'},
+            {'ticker': 'AVGO', 'name': 'Broadcom Inc.', 'price': 227.15, 'change': 3.45, 'change_percent': 1.54, 'reason': 'Also in Pelosi portfolio'},
+        ]
+    },
+    'GOOGL': {
+        'company_name': 'Alphabet Inc. (Google)',
+        'description': 'Tech giant and search leader. Nancy Pelosi purchased 50 call options on 1/14/2025 valued at $250K-$500K, showing continued confidence in big tech.',
+        'week_range_low': 165.50,
+        'week_range_high': 195.75,
+        'price_change': 1.85,
+        'price_change_percent': 0.99,
+        'similar_stocks': [
+            {'ticker': 'META', 'name': 'Meta Platforms', 'price': 638.25, 'change': 5.20, 'change_percent': 0.82, 'reason': 'Big Tech peer'},
+            {'ticker': 'AMZN', 'name': 'Amazon.com', 'price': 230.75, 'change': 2.10, 'change_percent': 0.92, 'reason': 'Also in Pelosi portfolio'},
+        ]
+    },
+    'AVGO': {
+        'company_name': 'Broadcom Inc.',
+        'description': 'Semiconductor and infrastructure software company. Nancy Pelosi made a significant purchase of $5M-$25M in call options on 11/22/2024.',
+        'week_range_low': 145.20,
+        'week_range_high': 240.50,
+        'price_change': 4.25,
+        'price_change_percent': 1.91,
+        'similar_stocks': [
+            {'ticker': 'NVDA', 'name': 'NVIDIA Corporation', 'price': 145.89, 'change': -2.45, 'change_percent': -1.65, 'reason': 'Also in Pelosi portfolio'},
+            {'ticker': 'QCOM', 'name': 'Qualcomm', 'price': 158.40, 'change': 0.85, 'change_percent': 0.54, 'reason': 'Semiconductor peer'},
+        ]
+    },
+    'PANW': {
+        'company_name': 'Palo Alto Networks',
+        'description': 'Cybersecurity leader. Nancy Pelosi exercised 140 call options on 12/20/2024 valued at $1M-$5M, betting on continued cybersecurity growth.',
+        'week_range_low': 175.80,
+        'week_range_high': 225.40,
+        'price_change': 2.15,
+        'price_change_percent': 1.03,
+        'similar_stocks': [
+            {'ticker': 'CRWD', 'name': 'CrowdStrike', 'price': 398.25, 'change': 3.80, 'change_percent': 0.96, 'reason': 'Also in Pelosi portfolio'},
+            {'ticker': 'FTNT', 'name': 'Fortinet', 'price': 98.50, 'change': -0.45, 'change_percent': -0.45, 'reason': 'Cybersecurity competitor'},
+        ]
+    },
+    'TEM': {
+        'company_name': 'Tempus AI, Inc.',
+        'description': 'AI-driven precision medicine company. Nancy Pelosi purchased 50 call options on 1/14/2025 for $50K-$100K, betting on AI healthcare.',
+        'week_range_low': 42.10,
+        'week_range_high': 95.30,
+        'price_change': 3.45,
+        'price_change_percent': 4.22,
+        'similar_stocks': [
+            {'ticker': 'ILMN', 'name': 'Illumina', 'price': 142.30, 'change': 1.20, 'change_percent': 0.85, 'reason': 'Genomics/healthcare AI'},
+            {'ticker': 'NVDA', 'name': 'NVIDIA', 'price': 145.89, 'change': -2.45, 'change_percent': -1.65, 'reason': 'AI infrastructure'},
+        ]
+    },
+    'AMZN': {
+        'company_name': 'Amazon.com, Inc.',
+        'description': 'E-commerce and cloud computing giant. Nancy Pelosi purchased 50 call options on 1/14/2025 valued at $250K-$500K.',
+        'week_range_low': 185.30,
+        'week_range_high': 240.15,
+        'price_change': 2.10,
+        'price_change_percent': 0.92,
+        'similar_stocks': [
+            {'ticker': 'GOOGL', 'name': 'Alphabet', 'price': 189.50, 'change': 1.85, 'change_percent': 0.99, 'reason': 'Also in Pelosi portfolio'},
+            {'ticker': 'MSFT', 'name': 'Microsoft', 'price': 445.20, 'change': 3.25, 'change_percent': 0.74, 'reason': 'Cloud competitor'},
+        ]
+    },
+    'VST': {
+        'company_name': 'Vistra Corp.',
+        'description': 'Energy company. Part of Nancy Pelosi\'s diversified portfolio with 7% allocation.',
+        'week_range_low': 95.40,
+        'week_range_high': 158.90,
+        'price_change': 1.25,
+        'price_change_percent': 0.87,
+        'similar_stocks': [
+            {'ticker': 'NEE', 'name': 'NextEra Energy', 'price': 72.45, 'change': 0.35, 'change_percent': 0.49, 'reason': 'Energy sector peer'},
+        ]
+    },
+    'CRWD': {
+        'company_name': 'CrowdStrike Holdings',
+        'description': 'Cybersecurity platform leader. Nancy Pelosi purchased $1M-$5M in call options on 11/22/2024.',
+        'week_range_low': 225.50,
+        'week_range_high': 420.75,
+        'price_change': 3.80,
+        'price_change_percent': 0.96,
+        'similar_stocks': [
+            {'ticker': 'PANW', 'name': 'Palo Alto Networks', 'price': 210.33, 'change': 2.15, 'change_percent': 1.03, 'reason': 'Also in Pelosi portfolio'},
+            {'ticker': 'ZS', 'name': 'Zscaler', 'price': 225.60, 'change': 2.40, 'change_percent': 1.08, 'reason': 'Cybersecurity peer'},
+        ]
+    },
+    'AAPL': {
+        'company_name': 'Apple Inc.',
+        'description': 'Consumer electronics giant. Nancy Pelosi sold 31,600 shares on 12/31/2024 for $5M-$25M, possibly taking profits.',
+        'week_range_low': 195.25,
+        'week_range_high': 260.10,
+        'price_change': -1.85,
+        'price_change_percent': -0.73,
+        'similar_stocks': [
+            {'ticker': 'MSFT', 'name': 'Microsoft', 'price': 445.20, 'change': 3.25, 'change_percent': 0.74, 'reason': 'Big Tech peer'},
+            {'ticker': 'GOOGL', 'name': 'Alphabet', 'price': 189.50, 'change': 1.85, 'change_percent': 0.99, 'reason': 'Also in Pelosi portfolio'},
+        ]
+    },
+    'MSFT': {
+        'company_name': 'Microsoft Corporation',
+        'description': 'Software and cloud computing leader. Nancy Pelosi purchased call options on 7/1/2024 for $1M-$5M.',
+        'week_range_low': 385.50,
+        'week_range_high': 468.35,
+        'price_change': 3.25,
+        'price_change_percent': 0.74,
+        'similar_stocks': [
+            {'ticker': 'GOOGL', 'name': 'Alphabet', 'price': 189.50, 'change': 1.85, 'change_percent': 0.99, 'reason': 'Also in Pelosi portfolio'},
+            {'ticker': 'AMZN', 'name': 'Amazon', 'price': 230.75, 'change': 2.10, 'change_percent': 0.92, 'reason': 'Cloud competitor'},
+        ]
+    },
+    'TSLA': {
+        'company_name': 'Tesla, Inc.',
+        'description': 'Electric vehicle and clean energy company. Part of Nancy Pelosi\'s portfolio with 3% allocation.',
+        'week_range_low': 315.20,
+        'week_range_high': 488.50,
+        'price_change': -5.40,
+        'price_change_percent': -1.29,
+        'similar_stocks': [
+            {'ticker': 'RIVN', 'name': 'Rivian', 'price': 12.45, 'change': -0.25, 'change_percent': -1.97, 'reason': 'EV competitor'},
+        ]
+    },
+})
+
+def default_stock_info(ticker):
+    """Placeholder details for tickers missing from STOCK_INFO"""
+    return {
+        'company_name': f'{ticker} Corporation',
+        'description': f'Stock information for {ticker}',
+        'week_range_low': 0.0,
+        'week_range_high': 0.0,
+        'price_change': 0.0,
+        'price_change_percent': 0.0,
+        'similar_stocks': []
+    }
+
+# Background scraping: handlers serve the last good portfolio while refreshes run off the request path
+REFRESH_INTERVAL_MINUTES = float(os.environ.get('PORTFOLIO_REFRESH_MINUTES', '30'))
+portfolio_refresher = PortfolioRefresher(PelosiTrackerScraper().get_portfolio_data, portfolio_data,
+                                         interval_minutes=REFRESH_INTERVAL_MINUTES)
+
+def current_snapshot():
+    """Last good portfolio snapshot; kicks off a background refresh when it is stale and the retry backoff allows.
+    Handlers call this once per request and read everything from the returned snapshot."""
+    snapshot = portfolio_refresher.current()
+    portfolio_refresher.refresh_if_due()
+    return snapshot
+
+def add_freshness_headers(response, snapshot):
+    """Tell clients which portfolio version they got and how old it is.
+    Versions are per process; X-Data-Epoch says which process's sequence the version belongs to."""
+    age = datetime.now().timestamp() - snapshot.fetched_at
+    response.headers['X-Data-Version'] = str(snapshot.version)
+    response.headers['X-Data-Epoch'] = portfolio_refresher.epoch
+    response.headers['X-Data-Age'] = str(int(age))
+    response.headers['X-Data-Stale'] = 'true' if age > portfolio_refresher.stale_after_seconds else 'false'
+    return response
+
+# Encoded and compressed JSON bodies, built once per snapshot version. The documents the
+# app's own pages load are compressed at maximum level up front; anything shaped by other
+# query arguments goes to a separate LRU, compressed fast and on demand, so arbitrary
+# query strings neither cost a brotli-11 pass nor evict the hot entries.
+response_cache = ResponseCache()
+variant_cache = ResponseCache(max_entries=128, on_demand=True)
+
+def cache_for(canonical):
+    return response_cache if canonical else variant_cache
+
+def known_ticker(snapshot, ticker):
+    """Whether an upper-case ticker is held or traded in the snapshot"""
+    return ticker in snapshot.holdings_by_ticker or bool(snapshot.trade_store.by_ticker(ticker))
+
+def encode_json(data):
+    """Same bytes jsonify() would send"""
+    return app.json.response(data).get_data()
+
+def serve_static(filename):
+    """Static files from precompressed variants negotiated on Accept-Encoding"""
+    return send_static_compressed(app.static_folder, filename)
+
+app.view_functions['static'] = serve_static
+
+class QueryArgError(ValueError):
+    """A query argument the API rejects; answered with 400 and the message"""
+
+@app.errorhandler(QueryArgError)
+def query_arg_error(error):
+    return jsonify({'error': str(error)}), 400
+
+# Chart resolutions ?points= snaps up to, so each series has a handful of cached variants
+CHART_RESOLUTIONS = (30, 60, 120, 240, 480, 960, 1920)
+
+def points_arg():
+    """?points=N chart resolution rounded up to the next CHART_RESOLUTIONS step (the
+    largest for anything beyond it), or None for the full series"""
+    if not request.args.get('points'):
+        return None
+    points = request.args.get('points', type=int)
+    if points is None or points < 3:
+        raise QueryArgError('points must be a whole number of at least 3')
+    return next((step for step in CHART_RESOLUTIONS if step >= points), CHART_RESOLUTIONS[-1])
+
+def list_arg(name):
+    """Comma-separated query argument as a de-duplicated, lower-cased list"""
+    values = [value.strip().lower() for value in request.args.get(name, '').split(',')]
+    return list(dict.fromkeys(value for value in values if value))
+
+def fields_arg(known):
+    """?fields=performance.total_invested,stats projection as a sorted cache-key tuple; empty for the
+    whole document. A field whose top-level name is not in known is rejected."""
+    fields = sorted(list_arg('fields'))
+    unknown = [field for field in fields if field.split('.', 1)[0] not in known]
+    if unknown:
+        raise QueryArgError(f"unknown fields {', '.join(unknown)}; use {', '.join(sorted(known))}")
+    return tuple(fields)
+
+@per_version
+def profile_index(snapshot):
+    """Every profile's portfolio keyed by id, built once per snapshot version"""
+    return {'nancy': snapshot.portfolio, **PROFILE_PORTFOLIOS}
+
 @app.route('/')
 def index():
     print("Index route called", flush=True)
-    return render_template('index.html')
+    return render_template('index.html', update_stream=UPDATE_STREAM)
 
 @app.route('/profiles')
 def profiles():
     print("Profiles dashboard route called", flush=True)
-    return render_template('profiles.html')
+    return render_template('profiles.html', update_stream=UPDATE_STREAM)
+
+# Chart resolution the pages ask for (CHART_POINTS in static/js), so inlined data matches the API's
+INITIAL_CHART_POINTS = 120
+
+def inline_json(body):
+    """Encoded JSON that is safe inside a <script type="application/json"> block"""
+    text = body.decode().replace('<', '\\u003c').replace('>', '\\u003e').replace('&', '\\u0026')
+    return Markup(text)
 
 @app.route('/profile')
 def profile():
     print("Profile route called", flush=True)
-    return render_template('profile.html')
+    # The page embeds its /api/profile-bundle data, so the first paint needs no API round trip
+    snapshot = current_snapshot()
+    bundle = profile_bundle_entry(snapshot, 'nancy', INITIAL_CHART_POINTS)
+    entry = response_cache.get(('profile-page', snapshot.version, bundle.etag),
+                               lambda: render_template('profile.html', initial_data=inline_json(bundle.body)).encode(),
+                               mimetype='text/html')
+    return add_freshness_headers(conditional_response(entry), snapshot)
 
 @app.route('/profile/<profile_id>')
 def profile_locked(profile_id):
     """Render locked profile page for coming soon profiles"""
     print(f"Locked profile route called for {profile_id}", flush=True)
     
-    # Profile information mapping with full details
-    profiles_info = {
-        'rick-scott': {
-            'name': 'Rick Scott',
-            'title': 'Senator, Florida',
-            'party': 'Republican',
-            'badge_class': 'badge-red',
-            'district': 'Florida',
-            'role': 'Senator',
-            'years_in_office': '2019 - Present',
-            'age': '71 years',
-            'committees_link': 'https://www.scott.senate.gov/',
-            'biography': 'Richard Lynn Scott is an American businessman and politician serving as the junior United States Senator from Florida since 2019. A member of the Republican Party, he previously served as the 45th governor of Florida from 2011 to 2019. Before entering politics, Scott was a healthcare executive and co-founder of Columbia Hospital Corporation.',
-            'filing_stats': {
-                'avg_reporting_time': 28,
-                'avg_filing_frequency': 62,
-                'time_since_last_filing': 45
-            },
-            'image_url': 'https://static.wixstatic.com/media/e2da02_6ce3f0fedeac4311982ea028e517202b~mv2.png'
-        },
-        'tommy-tuberville': {
-            'name': 'Tommy Tuberville',
-            'title': 'Senator, Alabama',
-            'party': 'Republican',
-            'badge_class': 'badge-red',
-            'district': 'Alabama',
-            'role': 'Senator',
-            'years_in_office': '2021 - Present',
-            'age': '69 years',
-            'committees_link': 'https://www.tuberville.senate.gov/',
-            'biography': 'Thomas Hawley Tuberville is an American politician and former college football coach serving as the junior United States Senator from Alabama since 2021. A member of the Republican Party, he previously coached college football for over 40 years, including head coaching positions at Auburn University, Texas Tech University, and the University of Cincinnati.',
-            'filing_stats': {
-                'avg_reporting_time': 31,
-                'avg_filing_frequency': 68,
-                'time_since_last_filing': 52
-            },
-            'image_url': 'https://static.wixstatic.com/media/e2da02_1873027f391c40d3a890751b381b64a1~mv2.png'
-        },
-        'josh-gottheimer': {
-            'name': 'Josh Gottheimer',
-            'title': 'Representative, New Jersey',
-            'party': 'Democrat',
-            'badge_class': 'badge-blue',
-            'district': 'District 5',
-            'role': 'Representative',
-            'years_in_office': '2017 - Present',
-            'age': '49 years',
-            'committees_link': 'https://gottheimer.house.gov/',
-            'biography': 'Joshua Gottheimer is an American politician serving as the U.S. Representative for New Jersey\'s 5th congressional district since 2017. A member of the Democratic Party, he previously worked as a speechwriter for President Bill Clinton and as a corporate attorney. Gottheimer is a member of the Problem Solvers Caucus and focuses on bipartisan solutions.',
-            'filing_stats': {
-                'avg_reporting_time': 26,
-                'avg_filing_frequency': 58,
-                'time_since_last_filing': 41
-            },
-            'image_url': 'https://static.wixstatic.com/media/e2da02_e31408565d714a04a9c2cc567586ac86~mv2.png'
-        },
-        'dan-crenshaw': {
-            'name': 'Dan Crenshaw',
-            'title': 'Representative, Texas',
-            'party': 'Republican',
-            'badge_class': 'badge-red',
-            'district': 'District 2',
-            'role': 'Representative',
-            'years_in_office': '2019 - Present',
-            'age': '40 years',
-            'committees_link': 'https://crenshaw.house.gov/',
-            'biography': 'Daniel Reed Crenshaw is an American politician and former Navy SEAL serving as the U.S. Representative for Texas\'s 2nd congressional district since 2019. A member of the Republican Party, he served as a Navy SEAL officer for 10 years, completing multiple deployments to Iraq and Afghanistan. He lost his right eye in an IED explosion in Afghanistan in 2012.',
-            'filing_stats': {
-                'avg_reporting_time': 29,
-                'avg_filing_frequency': 64,
-                'time_since_last_filing': 48
-            },
-            'image_url': 'https://static.wixstatic.com/media/e2da02_92039f4752cc427682ca9650cb0799c9~mv2.png'
-        },
-        'markwayne-mullin': {
-            'name': 'Markwayne Mullin',
-            'title': 'Senator, Oklahoma',
-            'party': 'Republican',
-            'badge_class': 'badge-red',
-            'district': 'Oklahoma',
-            'role': 'Senator',
-            'years_in_office': '2023 - Present',
-            'age': '46 years',
-            'committees_link': 'https://www.mullin.senate.gov/',
-            'biography': 'Markwayne Mullin is an American businessman and politician serving as the junior United States Senator from Oklahoma since 2023. A member of the Republican Party, he previously served as the U.S. Representative for Oklahoma\'s 2nd congressional district from 2013 to 2023. Before entering politics, Mullin owned and operated a plumbing business.',
-            'filing_stats': {
-                'avg_reporting_time': 33,
-                'avg_filing_frequency': 71,
-                'time_since_last_filing': 55
-            },
-            'image_url': 'https://static.wixstatic.com/media/e2da02_7f5176bc04474974940b201de37151ec~mv2.png'
-        },
-        'eric-trump': {
-            'name': 'Eric Trump',
-            'title': 'Businessman, New York',
-            'party': 'Republican',
-            'badge_class': 'badge-red',
-            'district': 'New York',
-            'role': 'Businessman',
-            'years_in_office': 'N/A',
-            'age': '40 years',
-            'committees_link': None,
-            'biography': 'Eric Frederick Trump is an American businessman and the executive vice president of the Trump Organization. He is the third child of former President Donald Trump and his first wife, Ivana Trump. Eric has been involved in the family real estate business since a young age and currently oversees the company\'s development and acquisition operations.',
-            'filing_stats': {
-                'avg_reporting_time': None,
-                'avg_filing_frequency': None,
-                'time_since_last_filing': None
-            },
-            'image_url': 'https://static.wixstatic.com/media/e2da02_de23f5c5eba9443587397fa27db0580c~mv2.png'
-        }
-    }
-    
-    profile_info = profiles_info.get(profile_id.lower())
-    if not profile_info:
-        # Default fallback
-        profile_info = {
-            'name': 'Profile',
-            'title': 'Coming Soon',
-            'party': 'Unknown',
-            'badge_class': 'badge-gray',
-            'district': 'TBA',
-            'role': 'TBA',
-            'years_in_office': 'TBA',
-            'age': 'TBA',
-            'committees_link': None,
-            'biography': 'Biography information coming soon.'
-        }
-    
+    profile_info = PROFILES_INFO.get(profile_id.lower(), DEFAULT_PROFILE_INFO)
     return render_template('profile_locked.html', **profile_info)
 
 @app.route('/stock/<ticker>')
 def stock_detail(ticker):
     print(f"Stock detail route called for {ticker}", flush=True)
-    return render_template('stock.html', ticker=ticker.upper())
+    # The page embeds its /api/stock data; the endpoint stays for refreshes
+    snapshot = current_snapshot()
+    ticker = ticker.upper()
+    stock = stock_entry(snapshot, ticker, INITIAL_CHART_POINTS)
+    entry = cache_for(known_ticker(snapshot, ticker)).get(('stock-page', snapshot.version, ticker, stock.etag),
+                               lambda: render_template('stock.html', ticker=ticker,
+                                                       initial_data=inline_json(stock.body)).encode(),
+                               mimetype='text/html')
+    return add_freshness_headers(conditional_response(entry), snapshot)
+
+def portfolio_changes(since, same_epoch, snapshot):
+    """Delta from version `since` to snapshot. The full portfolio instead when `since` came from another
+    process (epoch mismatch) or has left the history ring."""
+    previous = portfolio_refresher.snapshot(since) if same_epoch and since <= snapshot.version else None
+    if previous is None:
+        changes = {'version': snapshot.version, 'since': since, 'full': True, 'portfolio': snapshot.portfolio}
+    else:
+        changes = portfolio_delta(previous, snapshot)
+    changes['epoch'] = portfolio_refresher.epoch
+    return changes
 
 @app.route('/api/portfolio')
 def get_portfolio():
     print("Portfolio API called - returning real data", flush=True)
-    return jsonify(portfolio_data)
+    snapshot = current_snapshot()
+    since = request.args.get('since', type=int)
+    if since is not None:
+        # ?since=<version>&epoch=<X-Data-Epoch>; a missing or foreign epoch gets the full document
+        same_epoch = request.args.get('epoch') == portfolio_refresher.epoch
+        entry = variant_cache.get(('portfolio-delta', since, same_epoch, snapshot.version),
+                                  lambda: encode_json(portfolio_changes(since, same_epoch, snapshot)))
+        return add_freshness_headers(conditional_response(entry), snapshot)
+    points = points_arg()
+    if points is not None and points >= len(snapshot.historical_performance):
+        points = None  # Nothing to downsample; share the full document's entry
+    fields = fields_arg(snapshot.portfolio)
+
+    def encode():
+        portfolio = snapshot.portfolio
+        if points is not None:
+            # Chart history downsampled with LTTB; everything else is unchanged
+            portfolio = dict(portfolio, historical_performance=downsample_points(snapshot.historical_performance, points))
+        return encode_json(project(portfolio, fields) if fields else portfolio)
+
+    entry = cache_for(points is None and not fields).get(('portfolio', snapshot.version, points, fields), encode)
+    return add_freshness_headers(conditional_response(entry), snapshot)
 
 @app.route('/api/portfolio/<profile_id>')
 def get_profile_portfolio(profile_id):
     """Get portfolio data for a specific profile"""
     print(f"Profile portfolio API called for {profile_id}", flush=True)
     
-    # Mock data for other profiles (using similar structure to Nancy)
-    profiles_data = {
-        'nancy': portfolio_data,
-        'rick-scott': {
-            'holdings': [
-                {'ticker': 'AAPL', 'last_price': 250.35, 'price_display': '$250.35', 'weight': 22.0, 'weight_display': '22%'},
-                {'ticker': 'MSFT', 'last_price': 445.20, 'price_display': '$445.20', 'weight': 18.0, 'weight_display': '18%'},
-                {'ticker': 'GOOGL', 'last_price': 189.50, 'price_display': '$189.50', 'weight': 15.0, 'weight_display': '15%'},
-                {'ticker': 'AMZN', 'last_price': 230.75, 'price_display': '$230.75', 'weight': 12.0, 'weight_display': '12%'},
-                {'ticker': 'TSLA', 'last_price': 412.80, 'price_display': '$412.80', 'weight': 10.0, 'weight_display': '10%'},
-            ],
-            'performance': {
-                'performance_percent': 28.5,
-                'total_invested': 95000000
-            },
-            'stats': {
-                'holdings_count': 8,
-                'copiers': 8234
-            }
-        },
-        'tommy-tuberville': {
-            'holdings': [
-                {'ticker': 'NVDA', 'last_price': 145.89, 'price_display': '$145.89', 'weight': 25.0, 'weight_display': '25%'},
-                {'ticker': 'AMD', 'last_price': 125.30, 'price_display': '$125.30', 'weight': 20.0, 'weight_display': '20%'},
-                {'ticker': 'AAPL', 'last_price': 250.35, 'price_display': '$250.35', 'weight': 15.0, 'weight_display': '15%'},
-                {'ticker': 'MSFT', 'last_price': 445.20, 'price_display': '$445.20', 'weight': 12.0, 'weight_display': '12%'},
-            ],
-            'performance': {
-                'performance_percent': 32.0,
-                'total_invested': 72000000
-            },
-            'stats': {
-                'holdings_count': 6,
-                'copiers': 5123
-            }
-        },
-        'josh-gottheimer': {
-            'holdings': [
-                {'ticker': 'GOOGL', 'last_price': 189.50, 'price_display': '$189.50', 'weight': 20.0, 'weight_display': '20%'},
-                {'ticker': 'META', 'last_price': 638.25, 'price_display': '$638.25', 'weight': 18.0, 'weight_display': '18%'},
-                {'ticker': 'AAPL', 'last_price': 250.35, 'price_display': '$250.35', 'weight': 15.0, 'weight_display': '15%'},
-                {'ticker': 'MSFT', 'last_price': 445.20, 'price_display': '$445.20', 'weight': 14.0, 'weight_display': '14%'},
-            ],
-            'performance': {
-                'performance_percent': 25.8,
-                'total_invested': 68000000
-            },
-            'stats': {
-                'holdings_count': 7,
-                'copiers': 4567
-            }
-        },
-        'dan-crenshaw': {
-            'holdings': [
-                {'ticker': 'NVDA', 'last_price': 145.89, 'price_display': '$145.89', 'weight': 28.0, 'weight_display': '28%'},
-                {'ticker': 'TSLA', 'last_price': 412.80, 'price_display': '$412.80', 'weight': 22.0, 'weight_display': '22%'},
-                {'ticker': 'AAPL', 'last_price': 250.35, 'price_display': '$250.35', 'weight': 16.0, 'weight_display': '16%'},
-            ],
-            'performance': {
-                'performance_percent': 35.2,
-                'total_invested': 85000000
-            },
-            'stats': {
-                'holdings_count': 5,
-                'copiers': 6789
-            }
-        },
-        'markwayne-mullin': {
-            'holdings': [
-                {'ticker': 'XOM', 'last_price': 112.45, 'price_display': '$112.45', 'weight': 30.0, 'weight_display': '30%'},
-                {'ticker': 'CVX', 'last_price': 145.20, 'price_display': '$145.20', 'weight': 25.0, 'weight_display': '25%'},
-                {'ticker': 'AAPL', 'last_price': 250.35, 'price_display': '$250.35', 'weight': 15.0, 'weight_display': '15%'},
-            ],
-            'performance': {
-                'performance_percent': 18.5,
-                'total_invested': 55000000
-            },
-            'stats': {
-                'holdings_count': 6,
-                'copiers': 3456
-            }
-        },
-        'eric-trump': {
-            'holdings': [
-                {'ticker': 'DJT', 'last_price': 45.20, 'price_display': '$45.20', 'weight': 35.0, 'weight_display': '35%'},
-                {'ticker': 'AAPL', 'last_price': 250.35, 'price_display': '$250.35', 'weight': 20.0, 'weight_display': '20%'},
-                {'ticker': 'MSFT', 'last_price': 445.20, 'price_display': '$445.20', 'weight': 15.0, 'weight_display': '15%'},
-            ],
-            'performance': {
-                'performance_percent': 22.3,
-                'total_invested': 42000000
-            },
-            'stats': {
-                'holdings_count': 4,
-                'copiers': 2890
-            }
-        }
-    }
-    
-    profile_data = profiles_data.get(profile_id.lower())
+    snapshot = current_snapshot()
+    profile_id = profile_id.lower()
+    profile_data = profile_index(snapshot).get(profile_id)
     if profile_data:
-        return jsonify(profile_data)
+        fields = fields_arg(profile_data)
+        entry = cache_for(not fields).get(('profile', snapshot.version, profile_id, fields),
+                                          lambda: encode_json(project(profile_data, fields) if fields else profile_data))
+        return add_freshness_headers(conditional_response(entry), snapshot)
     else:
         return jsonify({'error': 'Profile not found'}), 404
 
+# Comparison benchmarks: the built-in S&P 500 series plus any <name>.csv in BENCHMARKS_DIR
+BENCHMARKS_DIR = os.environ.get('BENCHMARKS_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'benchmarks'))
+BENCHMARK_SERIES = {'sp500': GrowthSeries.from_points('sp500', SP500_COMPARISON), **load_benchmark_csvs(BENCHMARKS_DIR)}
+
+@per_version
+def portfolio_growth(snapshot):
+    """Portfolio history with its cumulative-growth prefix array, built once per snapshot version"""
+    return GrowthSeries.from_points('nancy', snapshot.historical_performance)
+
+@per_version
+def aligned_series(snapshot):
+    """Portfolio history and S&P 500 series as aligned NumPy arrays, built once per snapshot version"""
+    return AlignedSeries.align({'nancy': snapshot.historical_performance}, SP500_COMPARISON)
+
+# Fields returned by /api/portfolios when none are requested - what the profile cards show
+PROFILE_SUMMARY_FIELDS = ['performance', 'stats']
+
+@app.route('/api/portfolios')
+def get_profile_portfolios():
+    """Summaries for several profiles in one response: ?ids=nancy,rick-scott&fields=performance,stats"""
+    print("Batch portfolios API called", flush=True)
+    snapshot = current_snapshot()
+    index = profile_index(snapshot)
+    canonical = not request.args.get('ids') and not request.args.get('fields')
+    ids = list_arg('ids') or list(index)
+    fields = fields_arg({name for portfolio in index.values() for name in portfolio}) or tuple(PROFILE_SUMMARY_FIELDS)
+
+    def encode():
+        profiles = {}
+        for profile_id in ids:
+            portfolio = index.get(profile_id)
+            if portfolio is not None:
+                profiles[profile_id] = project(portfolio, fields)
+        missing = [profile_id for profile_id in ids if profile_id not in index]
+        return encode_json({'profiles': profiles, 'missing': missing})
+
+    entry = cache_for(canonical).get(('portfolios', snapshot.version, tuple(ids), fields), encode)
+    return add_freshness_headers(conditional_response(entry), snapshot)
+
+TRADES_PAGE_DEFAULT = 50
+TRADES_PAGE_MAX = 200
+
+@app.route('/api/trades')
+def get_trades():
+    """Newest-first trades page: ?from=&to=&ticker=&action=&cursor=&limit="""
+    print("Trades API called", flush=True)
+    snapshot = current_snapshot()
+    try:
+        start = date_ordinal(request.args['from']) if request.args.get('from') else None
+        end = date_ordinal(request.args['to']) if request.args.get('to') else None
+        if (request.args.get('from') and start is None) or (request.args.get('to') and end is None):
+            raise ValueError('from/to must be dates like 1/14/2025 or 2025-01-14')
+        before = decode_cursor(request.args['cursor']) if request.args.get('cursor') else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    limit = min(max(request.args.get('limit', TRADES_PAGE_DEFAULT, type=int), 1), TRADES_PAGE_MAX)
+    trades, next_key = snapshot.trade_store.page(start, end, request.args.get('ticker'),
+                                                 request.args.get('action'), before, limit)
+    return add_freshness_headers(jsonify({
+        'trades': trades,
+        'count': len(trades),
+        'next_cursor': encode_cursor(next_key) if next_key else None
+    }), snapshot)
+
+@app.route('/api/trade-volume')
+def get_trade_volume():
+    """Estimated buy/sell volume from the disclosed amount ranges: ?group_by=ticker,month,type"""
+    print("Trade volume API called", flush=True)
+    snapshot = current_snapshot()
+    group_by = list_arg('group_by') or list(GROUP_FIELDS)
+    unknown = [field for field in group_by if field not in GROUP_FIELDS]
+    if unknown:
+        return jsonify({'error': f"cannot group by {', '.join(unknown)}; use {', '.join(GROUP_FIELDS)}"}), 400
+
+    canonical = tuple(group_by) == GROUP_FIELDS
+    entry = cache_for(canonical).get(('trade-volume', snapshot.version, tuple(group_by)),
+                                     lambda: encode_json(trade_volume(snapshot.trade_store, group_by)))
+    return add_freshness_headers(conditional_response(entry), snapshot)
+
+@app.route('/api/options-exposure')
+def get_options_exposure():
+    """Open option positions with notional, moneyness, Black-Scholes value and greeks: ?as_of=&vol=&rate="""
+    print("Options exposure API called", flush=True)
+    snapshot = current_snapshot()
+    as_of = date_ordinal(request.args['as_of']) if request.args.get('as_of') else datetime.now().toordinal()
+    if as_of is None:
+        return jsonify({'error': 'as_of must be a date like 1/14/2025 or 2025-01-14'}), 400
+    vol = request.args.get('vol', DEFAULT_VOLATILITY, type=float)
+    rate = request.args.get('rate', DEFAULT_RISK_FREE_RATE, type=float)
+    if not (math.isfinite(vol) and vol > 0) or not math.isfinite(rate):
+        return jsonify({'error': 'vol must be a positive number and rate a finite number'}), 400
+
+    # Prices only change with a new snapshot, so the version covers price updates
+    def encode():
+        prices = {ticker: holding.get('last_price') for ticker, holding in snapshot.holdings_by_ticker.items()
+                  if holding.get('last_price')}
+        return encode_json(options_exposure(snapshot.trade_store, prices, as_of, rate, vol))
+
+    canonical = not any(request.args.get(name) for name in ('as_of', 'vol', 'rate'))
+    entry = cache_for(canonical).get(('options-exposure', snapshot.version, as_of, vol, rate), encode)
+    return add_freshness_headers(conditional_response(entry), snapshot)
+
+@app.route('/api/analytics')
+def get_analytics():
+    """Rolling returns, drawdown, volatility, Sharpe, beta/alpha and tracking error vs the S&P 500: ?window=&rf="""
+    print("Analytics API called", flush=True)
+    snapshot = current_snapshot()
+    aligned = aligned_series(snapshot)
+    max_window = max(len(aligned.dates) - 1, 1)
+    window = request.args.get('window', 12, type=int)
+    risk_free = request.args.get('rf', 0.0, type=float)
+    if window is None or not 1 <= window <= max_window:
+        return jsonify({'error': f'window must be a whole number of periods from 1 to {max_window}'}), 400
+    if risk_free is None or not math.isfinite(risk_free):
+        return jsonify({'error': 'rf must be a finite annual rate like 0.04'}), 400
+
+    canonical = not request.args.get('window') and not request.args.get('rf')
+    entry = cache_for(canonical).get(('analytics', snapshot.version, window, risk_free),
+                                     lambda: encode_json(compute_analytics(aligned, window, risk_free)))
+    return add_freshness_headers(conditional_response(entry), snapshot)
+
 @app.route('/api/update')
 def force_update():
     print("Force update called", flush=True)
-    return jsonify({'success': True, 'data': portfolio_data})
+    # Never scrape on the request path - start a refresh and answer with the current portfolio.
+    # Forced refreshes skip the staleness check but still wait out the retry backoff.
+    started = datetime.now().timestamp() >= portfolio_refresher.next_attempt_at() and portfolio_refresher.refresh_async()
+    snapshot = portfolio_refresher.current()
+    return add_freshness_headers(jsonify({
+        'success': True,
+        'refresh_started': started,
+        'refreshing': portfolio_refresher.is_refreshing(),
+        'version': snapshot.version,
+        'age_seconds': int(datetime.now().timestamp() - snapshot.fetched_at),
+        'stale': portfolio_refresher.is_stale(),
+        'data': snapshot.portfolio
+    }), snapshot)
+
+# Server-sent events: one small message per published snapshot instead of clients polling /api/portfolio.
+# Serverless hosts (Vercel sets VERCEL=1) end a function after a few seconds and cannot hold a
+# stream open, so pages there poll from the start; UPDATE_STREAM=on/off overrides the detection.
+UPDATE_STREAM = os.environ.get('UPDATE_STREAM', 'off' if os.environ.get('VERCEL') else 'on') == 'on'
+STREAM_HEARTBEAT_SECONDS = 25
+STREAM_RETRY_MS = 10000
+# The threaded server spends a thread per open stream, so bound how many there are and
+# how long each lives; clients reconnect after STREAM_RETRY_MS or poll on a 503. Under a
+# gevent worker a stream is a greenlet and the limit can be raised (see README).
+STREAM_MAX_CONNECTIONS = int(os.environ.get('STREAM_MAX_CONNECTIONS', '32'))
+STREAM_MAX_SECONDS = 300
+stream_slots = threading.BoundedSemaphore(STREAM_MAX_CONNECTIONS)
+
+def snapshot_event(snapshot):
+    """SSE message announcing a snapshot version; the id lets a reconnecting client resume"""
+    epoch = portfolio_refresher.epoch
+    data = encode_json({'version': snapshot.version, 'epoch': epoch, 'fetched_at': snapshot.fetched_at}).decode().strip()
+    return f"id: {epoch}.{snapshot.version}\nevent: snapshot\ndata: {data}\n\n"
+
+@app.route('/api/stream')
+def stream_updates():
+    """Push a snapshot event whenever the background refresh publishes new data.
+    Idle connections sleep on the refresher's condition variable and only wake to
+    send a comment heartbeat, so they cost no CPU and no scraping. Each stream
+    still holds a server thread, so there are at most STREAM_MAX_CONNECTIONS of
+    them, each ended after STREAM_MAX_SECONDS."""
+    if not UPDATE_STREAM:
+        return jsonify({'error': 'Update stream is off on this deployment; poll /api/portfolio'}), 404
+    if not stream_slots.acquire(blocking=False):
+        print("Update stream rejected: too many open streams", flush=True)
+        return jsonify({'error': 'Too many open update streams; poll instead'}), 503
+    print("Update stream opened", flush=True)
+    seen = request.headers.get('Last-Event-ID')
+
+    def events():
+        snapshot = portfolio_refresher.current()
+        yield f"retry: {STREAM_RETRY_MS}\n\n"
+        if seen != f"{portfolio_refresher.epoch}.{snapshot.version}":
+            yield snapshot_event(snapshot)
+        version = snapshot.version
+        deadline = time.monotonic() + STREAM_MAX_SECONDS
+        while time.monotonic() < deadline:
+            timeout = min(STREAM_HEARTBEAT_SECONDS, deadline - time.monotonic())
+            snapshot = portfolio_refresher.wait_for_version(version, timeout=max(timeout, 0))
+            if snapshot.version > version:
+                version = snapshot.version
+                yield snapshot_event(snapshot)
+            else:
+                yield ": heartbeat\n\n"
+
+    response = Response(events(), mimetype='text/event-stream')
+    # Runs when the server closes the response, whether or not the stream ever started
+    response.call_on_close(stream_slots.release)
+    response.headers['Cache-Control'] = 'no-cache'
+    # Keep reverse proxies from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 @app.route('/api/nancy-quote')
 def get_nancy_quote():
@@ -579,10 +1085,14 @@ def get_nancy_quote():
 @app.route('/api/trade-predictions')
 def get_trade_predictions():
     """Predict next trades based on real patterns - FOR ENTERTAINMENT ONLY"""
-    
+    snapshot = current_snapshot()
+    return add_freshness_headers(jsonify(trade_predictions(snapshot)), snapshot)
+
+def trade_predictions(snapshot):
+    """Next-trade predictions from a snapshot's holdings and recent trades"""
     # Analyze real trading patterns
-    current_holdings = [h['ticker'] for h in NANCY_PELOSI_HOLDINGS]
-    recent_trades = NANCY_PELOSI_TRADES[:10]
+    current_holdings = [h['ticker'] for h in snapshot.holdings]
+    recent_trades = snapshot.trades[:10]
     recent_tickers = [t['ticker'] for t in recent_trades]
     
     # Count sector allocation (she loves tech)
@@ -653,7 +1163,7 @@ def get_trade_predictions():
     # Sort by confidence and return top 3
     predictions.sort(key=lambda x: x['confidence'], reverse=True)
     
-    return jsonify({
+    return {
         'predictions': predictions[:3],
         'analysis': {
             'tech_allocation': 85,
@@ -662,184 +1172,126 @@ def get_trade_predictions():
             'typical_trade_size': '$1M - $5M'
         },
         'disclaimer': 'ENTERTAINMENT ONLY: Predictions based on historical trading patterns. Not financial advice. Not based on insider information.'
-    })
+    }
 
 @app.route('/api/sp500-comparison')
 def get_sp500_comparison():
-    """Get S&P 500 comparison data"""
-    # Calculate returns
-    pelosi_start = HISTORICAL_PERFORMANCE[0]['value']
-    pelosi_end = HISTORICAL_PERFORMANCE[-1]['value']
-    pelosi_return = ((pelosi_end - pelosi_start) / pelosi_start) * 100
-    
-    sp500_start = SP500_COMPARISON[0]['value']
-    sp500_end = SP500_COMPARISON[-1]['value']
-    sp500_return = ((sp500_end - sp500_start) / sp500_start) * 100
-    
-    outperformance = pelosi_return - sp500_return
-    
-    return jsonify({
-        'pelosi_data': HISTORICAL_PERFORMANCE,
-        'sp500_data': SP500_COMPARISON,
+    """Get S&P 500 (or another benchmark's) comparison data: ?from=&to=&benchmark="""
+    snapshot = current_snapshot()
+    name = (request.args.get('benchmark') or 'sp500').lower()
+    benchmark = BENCHMARK_SERIES.get(name)
+    if benchmark is None:
+        return jsonify({'error': f"Unknown benchmark {name}", 'benchmarks': sorted(BENCHMARK_SERIES)}), 404
+    start = date_key(request.args['from']) if request.args.get('from') else None
+    end = date_key(request.args['to']) if request.args.get('to') else None
+    if (request.args.get('from') and start is None) or (request.args.get('to') and end is None):
+        return jsonify({'error': 'from/to must be dates like 2022-05, 2022-05-31 or 5/31/2022'}), 400
+
+    # Snap the requested range to the portfolio's own points, then look up both returns in O(1)
+    portfolio = portfolio_growth(snapshot)
+    window = portfolio.index_range(start, end)
+    if window is None:
+        return jsonify({'error': 'No data in the requested range'}), 404
+    resolution = points_arg()
+    if resolution is not None and resolution >= window[1] - window[0] + 1:
+        resolution = None
+    canonical = name == 'sp500' and not request.args.get('from') and not request.args.get('to') and resolution is None
+    entry = cache_for(canonical).get(('sp500-comparison', snapshot.version, name, window, resolution),
+                                     lambda: encode_json(benchmark_comparison(portfolio, name, window, resolution)))
+    return add_freshness_headers(conditional_response(entry), snapshot)
+
+def benchmark_comparison(portfolio, name, window, resolution=None):
+    """Portfolio vs benchmark returns and chart series over the portfolio's [i, j] index window"""
+    benchmark = BENCHMARK_SERIES[name]
+    i, j = window
+    points = portfolio.points[i:j + 1]
+    # Benchmark sampled on the portfolio's dates and rebased to its starting value, so both share one chart axis
+    bench_indexes = benchmark.as_of(portfolio.ordinals[i:j + 1])
+    pelosi_return = portfolio.window_return(i, j) * 100
+    sp500_return = benchmark.window_return(int(bench_indexes[0]), int(bench_indexes[-1])) * 100
+    pelosi_data = list(points)
+    sp500_data = benchmark.rebased(bench_indexes, [p['date'] for p in points], points[0]['value'])
+    if resolution is not None and resolution < len(points):
+        # Both series keep the points LTTB picks for the portfolio, so the chart stays aligned
+        kept = lttb_indices(portfolio.ordinals[i:j + 1], portfolio.growth[i:j + 1], resolution)
+        pelosi_data = [pelosi_data[k] for k in kept]
+        sp500_data = [sp500_data[k] for k in kept]
+    return {
+        'benchmark': name,
+        'pelosi_data': pelosi_data,
+        'sp500_data': sp500_data,
         'pelosi_return': round(pelosi_return, 2),
         'sp500_return': round(sp500_return, 2),
-        'outperformance': round(outperformance, 2),
-        'period': 'May 2022 - January 2025'
-    })
+        'outperformance': round(pelosi_return - sp500_return, 2),
+        'period': f"{month_label(portfolio.points[i]['date'])} - {month_label(portfolio.points[j]['date'])}"
+    }
+
+@app.route('/api/profile-bundle/<profile_id>')
+def get_profile_bundle(profile_id):
+    """Everything the profile page renders in one response: the portfolio, S&P 500 comparison,
+    trade predictions and quotes. ?points= downsamples the comparison chart only."""
+    print(f"Profile bundle API called for {profile_id}", flush=True)
+    snapshot = current_snapshot()
+    profile_id = profile_id.lower()
+    if profile_id not in profile_index(snapshot):
+        return jsonify({'error': 'Profile not found'}), 404
+    entry = profile_bundle_entry(snapshot, profile_id, points_arg())
+    return add_freshness_headers(conditional_response(entry), snapshot)
+
+def profile_bundle_entry(snapshot, profile_id, resolution=None):
+    """Encoded profile bundle for a known profile id, cached per (version, profile, points)"""
+    portfolio = profile_index(snapshot)[profile_id]
+
+    def encode():
+        bundle = {'profile_id': profile_id, 'version': snapshot.version, 'portfolio': portfolio,
+                  'sp500_comparison': None, 'trade_predictions': None, 'quotes': []}
+        # The comparison, predictions and quotes only exist for Nancy's live portfolio
+        if profile_id == 'nancy':
+            growth = portfolio_growth(snapshot)
+            window = growth.index_range(None, None)
+            if window is not None:
+                bundle['sp500_comparison'] = benchmark_comparison(growth, 'sp500', window, resolution)
+            bundle['trade_predictions'] = trade_predictions(snapshot)
+            bundle['quotes'] = NANCY_QUOTES
+        return encode_json(bundle)
+
+    canonical = resolution in (None, INITIAL_CHART_POINTS)
+    return cache_for(canonical).get(('profile-bundle', snapshot.version, profile_id, resolution), encode)
 
 @app.route('/api/stock/<ticker>')
 def get_stock_data(ticker):
     print(f"Stock API called for {ticker}", flush=True)
-    
+    snapshot = current_snapshot()
+    ticker = ticker.upper()
+    entry = stock_entry(snapshot, ticker, points_arg(), fields_arg(STOCK_FIELDS))
+    return add_freshness_headers(conditional_response(entry), snapshot)
+
+def stock_entry(snapshot, ticker, points=None, fields=()):
+    """Encoded stock detail for an upper-case ticker"""
+    def encode():
+        stock_data = build_stock_data(snapshot, ticker, points)
+        return encode_json(project(stock_data, fields) if fields else stock_data)
+
+    # Price history is laid out on calendar days, so encoded bytes are reused for one day per version
+    key = ('stock', snapshot.version, ticker, datetime.now().strftime('%Y-%m-%d'), points, fields)
+    canonical = known_ticker(snapshot, ticker) and points in (None, INITIAL_CHART_POINTS) and not fields
+    return cache_for(canonical).get(key, encode)
+
+# Top-level keys of the stock detail document, for validating ?fields=
+STOCK_FIELDS = ('ticker', 'company_name', 'exchange', 'current_price', 'price_change', 'price_change_percent',
+                'week_range_low', 'week_range_high', 'status', 'description', 'trades', 'similar_stocks',
+                'price_history')
+
+def build_stock_data(snapshot, ticker, points=None):
+    """Stock detail document for one ticker from a snapshot"""
     # Filter trades for this ticker
-    ticker_trades = [t for t in NANCY_PELOSI_TRADES if t['ticker'].upper() == ticker.upper()]
+    ticker_trades = snapshot.trade_store.by_ticker(ticker)
     
     # Get holding info
-    holding = next((h for h in NANCY_PELOSI_HOLDINGS if h['ticker'].upper() == ticker.upper()), None)
+    holding = snapshot.holdings_by_ticker.get(ticker.upper())
     
     # Stock-specific data
-    stock_info = {
-        'NVDA': {
-            'company_name': 'NVIDIA Corporation',
-            'description': 'Leading AI chip manufacturer. Nancy Pelosi has been actively trading NVDA, including a major sale of 10,000 shares on 12/31/2024 and exercising call options.',
-            'week_range_low': 108.13,
-            'week_range_high': 152.89,
-            'price_change': -2.45,
-            'price_change_percent': -1.65,
-            'similar_stocks': [
-                {'ticker': 'AMD', 'name': 'Advanced Micro Devices', 'price': 125.30, 'change': -1.20, 'change_percent': -0.95, 'reason': 'Semiconductor competitor'},
-                {'ticker': 'AVGO', 'name': 'Broadcom Inc.', 'price': 227.15, 'change': 3.45, 'change_percent': 1.54, 'reason': 'Also in Pelosi portfolio'},
-            ]
-        },
-        'GOOGL': {
-            'company_name': 'Alphabet Inc. (Google)',
-            'description': 'Tech giant and search leader. Nancy Pelosi purchased 50 call options on 1/14/2025 valued at $250K-$500K, showing continued confidence in big tech.',
-            'week_range_low': 165.50,
-            'week_range_high': 195.75,
-            'price_change': 1.85,
-            'price_change_percent': 0.99,
-            'similar_stocks': [
-                {'ticker': 'META', 'name': 'Meta Platforms', 'price': 638.25, 'change': 5.20, 'change_percent': 0.82, 'reason': 'Big Tech peer'},
-                {'ticker': 'AMZN', 'name': 'Amazon.com', 'price': 230.75, 'change': 2.10, 'change_percent': 0.92, 'reason': 'Also in Pelosi portfolio'},
-            ]
-        },
-        'AVGO': {
-            'company_name': 'Broadcom Inc.',
-            'description': 'Semiconductor and infrastructure software company. Nancy Pelosi made a significant purchase of $5M-$25M in call options on 11/22/2024.',
-            'week_range_low': 145.20,
-            'week_range_high': 240.50,
-            'price_change': 4.25,
-            'price_change_percent': 1.91,
-            'similar_stocks': [
-                {'ticker': 'NVDA', 'name': 'NVIDIA Corporation', 'price': 145.89, 'change': -2.45, 'change_percent': -1.65, 'reason': 'Also in Pelosi portfolio'},
-                {'ticker': 'QCOM', 'name': 'Qualcomm', 'price': 158.40, 'change': 0.85, 'change_percent': 0.54, 'reason': 'Semiconductor peer'},
-            ]
-        },
-        'PANW': {
-            'company_name': 'Palo Alto Networks',
-            'description': 'Cybersecurity leader. Nancy Pelosi exercised 140 call options on 12/20/2024 valued at $1M-$5M, betting on continued cybersecurity growth.',
-            'week_range_low': 175.80,
-            'week_range_high': 225.40,
-            'price_change': 2.15,
-            'price_change_percent': 1.03,
-            'similar_stocks': [
-                {'ticker': 'CRWD', 'name': 'CrowdStrike', 'price': 398.25, 'change': 3.80, 'change_percent': 0.96, 'reason': 'Also in Pelosi portfolio'},
-                {'ticker': 'FTNT', 'name': 'Fortinet', 'price': 98.50, 'change': -0.45, 'change_percent': -0.45, 'reason': 'Cybersecurity competitor'},
-            ]
-        },
-        'TEM': {
-            'company_name': 'Tempus AI, Inc.',
-            'description': 'AI-driven precision medicine company. Nancy Pelosi purchased 50 call options on 1/14/2025 for $50K-$100K, betting on AI healthcare.',
-            'week_range_low': 42.10,
-            'week_range_high': 95.30,
-            'price_change': 3.45,
-            'price_change_percent': 4.22,
-            'similar_stocks': [
-                {'ticker': 'ILMN', 'name': 'Illumina', 'price': 142.30, 'change': 1.20, 'change_percent': 0.85, 'reason': 'Genomics/healthcare AI'},
-                {'ticker': 'NVDA', 'name': 'NVIDIA', 'price': 145.89, 'change': -2.45, 'change_percent': -1.65, 'reason': 'AI infrastructure'},
-            ]
-        },
-        'AMZN': {
-            'company_name': 'Amazon.com, Inc.',
-            'description': 'E-commerce and cloud computing giant. Nancy Pelosi purchased 50 call options on 1/14/2025 valued at $250K-$500K.',
-            'week_range_low': 185.30,
-            'week_range_high': 240.15,
-            'price_change': 2.10,
-            'price_change_percent': 0.92,
-            'similar_stocks': [
-                {'ticker': 'GOOGL', 'name': 'Alphabet', 'price': 189.50, 'change': 1.85, 'change_percent': 0.99, 'reason': 'Also in Pelosi portfolio'},
-                {'ticker': 'MSFT', 'name': 'Microsoft', 'price': 445.20, 'change': 3.25, 'change_percent': 0.74, 'reason': 'Cloud competitor'},
-            ]
-        },
-        'VST': {
-            'company_name': 'Vistra Corp.',
-            'description': 'Energy company. Part of Nancy Pelosi\'s diversified portfolio with 7% allocation.',
-            'week_range_low': 95.40,
-            'week_range_high': 158.90,
-            'price_change': 1.25,
-            'price_change_percent': 0.87,
-            'similar_stocks': [
-                {'ticker': 'NEE', 'name': 'NextEra Energy', 'price': 72.45, 'change': 0.35, 'change_percent': 0.49, 'reason': 'Energy sector peer'},
-            ]
-        },
-        'CRWD': {
-            'company_name': 'CrowdStrike Holdings',
-            'description': 'Cybersecurity platform leader. Nancy Pelosi purchased $1M-$5M in call options on 11/22/2024.',
-            'week_range_low': 225.50,
-            'week_range_high': 420.75,
-            'price_change': 3.80,
-            'price_change_percent': 0.96,
-            'similar_stocks': [
-                {'ticker': 'PANW', 'name': 'Palo Alto Networks', 'price': 210.33, 'change': 2.15, 'change_percent': 1.03, 'reason': 'Also in Pelosi portfolio'},
-                {'ticker': 'ZS', 'name': 'Zscaler', 'price': 225.60, 'change': 2.40, 'change_percent': 1.08, 'reason': 'Cybersecurity peer'},
-            ]
-        },
-        'AAPL': {
-            'company_name': 'Apple Inc.',
-            'description': 'Consumer electronics giant. Nancy Pelosi sold 31,600 shares on 12/31/2024 for $5M-$25M, possibly taking profits.',
-            'week_range_low': 195.25,
-            'week_range_high': 260.10,
-            'price_change': -1.85,
-            'price_change_percent': -0.73,
-            'similar_stocks': [
-                {'ticker': 'MSFT', 'name': 'Microsoft', 'price': 445.20, 'change': 3.25, 'change_percent': 0.74, 'reason': 'Big Tech peer'},
-                {'ticker': 'GOOGL', 'name': 'Alphabet', 'price': 189.50, 'change': 1.85, 'change_percent': 0.99, 'reason': 'Also in Pelosi portfolio'},
-            ]
-        },
-        'MSFT': {
-            'company_name': 'Microsoft Corporation',
-            'description': 'Software and cloud computing leader. Nancy Pelosi purchased call options on 7/1/2024 for $1M-$5M.',
-            'week_range_low': 385.50,
-            'week_range_high': 468.35,
-            'price_change': 3.25,
-            'price_change_percent': 0.74,
-            'similar_stocks': [
-                {'ticker': 'GOOGL', 'name': 'Alphabet', 'price': 189.50, 'change': 1.85, 'change_percent': 0.99, 'reason': 'Also in Pelosi portfolio'},
-                {'ticker': 'AMZN', 'name': 'Amazon', 'price': 230.75, 'change': 2.10, 'change_percent': 0.92, 'reason': 'Cloud competitor'},
-            ]
-        },
-        'TSLA': {
-            'company_name': 'Tesla, Inc.',
-            'description': 'Electric vehicle and clean energy company. Part of Nancy Pelosi\'s portfolio with 3% allocation.',
-            'week_range_low': 315.20,
-            'week_range_high': 488.50,
-            'price_change': -5.40,
-            'price_change_percent': -1.29,
-            'similar_stocks': [
-                {'ticker': 'RIVN', 'name': 'Rivian', 'price': 12.45, 'change': -0.25, 'change_percent': -1.97, 'reason': 'EV competitor'},
-            ]
-        },
-    }
-    
-    info = stock_info.get(ticker.upper(), {
-        'company_name': f'{ticker.upper()} Corporation',
-        'description': f'Stock information for {ticker.upper()}',
-        'week_range_low': 0.0,
-        'week_range_high': 0.0,
-        'price_change': 0.0,
-        'price_change_percent': 0.0,
-        'similar_stocks': []
-    })
+    info = STOCK_INFO.get(ticker.upper()) or default_stock_info(ticker.upper())
     
     # Generate realistic price history based on actual stock performance
     from datetime import datetime, timedelta
@@ -869,6 +1321,9 @@ def get_stock_data(ticker):
         date = (datetime.now() - timedelta(days=i)).strftime('%Y-%m-%d')
         price_history.append({'date': date, 'price': round(price, 2)})
     
+    if points is not None:
+        price_history = downsample_points(price_history, points, value_key='price')
+    
     stock_data = {
         'ticker': ticker.upper(),
         'company_name': info['company_name'],
@@ -885,11 +1340,13 @@ def get_stock_data(ticker):
         'price_history': price_history
     }
     
-    return jsonify(stock_data)
+    return stock_data
 
 if __name__ == '__main__':
     print("Starting server with REAL Nancy Pelosi data...", flush=True)
     print(f"Loaded {len(NANCY_PELOSI_TRADES)} real trades", flush=True)
     print(f"Loaded {len(NANCY_PELOSI_HOLDINGS)} holdings", flush=True)
+    portfolio_refresher.start()
+    portfolio_refresher.refresh_async()
     sys.stdout.flush()
     app.run(host='127.0.0.1', port=8080, debug=False, use_reloader=False, threaded=True)
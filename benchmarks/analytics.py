@@ -0,0 +1,50 @@
+"""
+Time to compute /api/analytics metrics as the series grow
+Runs compute_analytics over synthetic random-walk series: the real monthly
+history, then daily history for a growing number of profiles.
+
+Usage: python benchmarks/analytics.py [--years 10] [--profiles 1,50,500]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics import AlignedSeries, compute_analytics
+
+
+def synthetic(profiles: int, days: int, seed: int = 7) -> AlignedSeries:
+    """Daily random-walk values for `profiles` series plus a benchmark"""
+    rng = np.random.default_rng(seed)
+    start = date(2015, 1, 1)
+    dates = [(start + timedelta(days=i)).isoformat() for i in range(days)]
+    bench = 100 * np.cumprod(1 + rng.normal(0.0004, 0.01, days))
+    values = 100 * np.cumprod(1 + rng.normal(0.0005, 0.015, (profiles, days)), axis=1)
+    series = {f'p{i}': [{'date': d, 'value': v} for d, v in zip(dates, row)] for i, row in enumerate(values)}
+    return AlignedSeries.align(series, [{'date': d, 'value': v} for d, v in zip(dates, bench)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--profiles', default='1,50,500')
+    args = parser.parse_args()
+
+    days = args.years * 252
+    print(f"{'profiles':>9}{'periods':>9}{'build (ms)':>12}{'compute (ms)':>14}")
+    for profiles in (int(p) for p in args.profiles.split(',')):
+        start = time.perf_counter()
+        aligned = synthetic(profiles, days)
+        aligned_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        compute_analytics(aligned, window=252)
+        print(f"{profiles:>9}{days:>9}{aligned_ms:>12.1f}{(time.perf_counter() - start) * 1000:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
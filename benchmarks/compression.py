@@ -0,0 +1,79 @@
+"""
+Bytes on the wire and CPU per request for /api/portfolio and style.css
+"before" re-encodes the portfolio with jsonify() / streams the file uncompressed on
+every request (plus an on-the-fly gzip for comparison); "after" serves the stored
+identity, gzip and brotli variants from the response cache.
+
+Usage: python benchmarks/compression.py [--requests 2000]
+"""
+import argparse
+import gzip
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import jsonify, send_from_directory
+
+import app as tracker
+from response_cache import ENCODINGS
+
+
+def register_baselines():
+    """Routes reproducing the pre-cache handlers, for comparison only"""
+    def portfolio_jsonify():
+        return jsonify(tracker.current_snapshot().portfolio)
+
+    def portfolio_gzip_per_request():
+        response = jsonify(tracker.current_snapshot().portfolio)
+        response.set_data(gzip.compress(response.get_data(), compresslevel=6))
+        response.headers['Content-Encoding'] = 'gzip'
+        return response
+
+    def static_plain(filename):
+        return send_from_directory(tracker.app.static_folder, filename)
+
+    tracker.app.add_url_rule('/bench/portfolio', 'bench_portfolio', portfolio_jsonify)
+    tracker.app.add_url_rule('/bench/portfolio-gzip', 'bench_portfolio_gzip', portfolio_gzip_per_request)
+    tracker.app.add_url_rule('/bench/static/<path:filename>', 'bench_static', static_plain)
+
+
+def measure(client, path: str, accept_encoding: str, requests: int):
+    """(bytes per response, CPU microseconds per request)"""
+    headers = {'Accept-Encoding': accept_encoding}
+    size = len(client.get(path, headers=headers).get_data())
+    start = time.process_time()
+    for _ in range(requests):
+        client.get(path, headers=headers).get_data()
+    return size, (time.process_time() - start) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    register_baselines()
+    client = tracker.app.test_client()
+    cases = [
+        ('portfolio', 'before: jsonify', '/bench/portfolio', 'identity'),
+        ('portfolio', 'before: jsonify+gzip', '/bench/portfolio-gzip', 'gzip'),
+        ('portfolio', 'after: identity', '/api/portfolio', 'identity'),
+        ('portfolio', 'after: gzip', '/api/portfolio', 'gzip'),
+        ('style.css', 'before: send_file', '/bench/static/css/style.css', 'identity'),
+        ('style.css', 'after: identity', '/static/css/style.css', 'identity'),
+        ('style.css', 'after: gzip', '/static/css/style.css', 'gzip'),
+    ]
+    if 'br' in ENCODINGS:
+        cases.insert(4, ('portfolio', 'after: br', '/api/portfolio', 'br'))
+        cases.append(('style.css', 'after: br', '/static/css/style.css', 'br'))
+
+    print(f"{'resource':<11}{'variant':<22}{'bytes':>9}{'cpu us/req':>12}")
+    for resource, label, path, encoding in cases:
+        size, cpu = measure(client, path, encoding, args.requests)
+        print(f"{resource:<11}{label:<22}{size:>9,}{cpu:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+// Client-side rendering for the stand-in pages: the DOM is built from JSON
+// fetched after load, like the real JS-rendered site.
+function cell(row, text) {
+    var td = document.createElement('td');
+    td.textContent = text;
+    row.appendChild(td);
+    return td;
+}
+
+function renderPortfolio(url) {
+    fetch(url).then(function (r) { return r.json(); }).then(function (data) {
+        var body = document.querySelector('#holdings tbody');
+        data.holdings.forEach(function (h) {
+            var row = document.createElement('tr');
+            cell(row, h.ticker);
+            cell(row, '$' + h.price.toFixed(2));
+            cell(row, h.weight + '%');
+            body.appendChild(row);
+        });
+        document.getElementById('holdings-count').textContent = data.stats.holdingsCount;
+        document.getElementById('copiers').textContent = data.stats.copiers.toLocaleString('en-US');
+        document.getElementById('performance').textContent =
+            '+' + data.performance.returnPercent + '% performance · Total Value US$' + (data.performance.totalValue / 1e6) + 'M';
+        var trades = document.getElementById('trades');
+        data.trades.forEach(function (t) {
+            var div = document.createElement('div');
+            var a = document.createElement('a');
+            a.href = '/stock/' + t.ticker.toLowerCase();
+            a.textContent = t.ticker;
+            div.appendChild(a);
+            div.appendChild(document.createTextNode(' ' + t.transactionType + ' ' + t.tradeDate + ' ' + t.amount));
+            trades.appendChild(div);
+        });
+        document.getElementById('filing').textContent =
+            'Avg. Reporting Time ' + data.filing.avgReportingDays + ' days · Avg. Filing Frequency ' +
+            data.filing.avgFilingFrequencyDays + ' days · Time Since Last Filing ' + data.filing.daysSinceLastFiling + ' days';
+        return fetch(url + '/history');
+    }).then(function (r) { return r.json(); }).then(function (history) {
+        window.__chartPoints = history.points.length;
+    });
+}
+
+function renderStock(url) {
+    fetch(url).then(function (r) { return r.json(); }).then(function (data) {
+        document.getElementById('name').textContent = data.name + ' (' + data.ticker + ')';
+        document.getElementById('quote').textContent =
+            data.exchange + ' · Current Price $' + data.price.toFixed(2) + ' (' + data.changePercent + '%)';
+        var body = document.querySelector('#activity tbody');
+        data.trades.forEach(function (t) {
+            var row = document.createElement('tr');
+            [t.politician, t.tradeDate, t.filedDate, t.transactionType, t.assetType, t.amount, t.excessReturn]
+                .forEach(function (v) { cell(row, v); });
+            body.appendChild(row);
+        });
+    });
+}
@@ -0,0 +1,42 @@
+"""
+Compare the DOM and network-capture scrape modes against the stand-in server
+Scrapes the stand-in portfolio and NVDA pages in both modes and prints how long
+each took and how many holdings, trades and history points each one found.
+
+Usage: python benchmarks/network_capture.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper import DriverPool, PelosiTrackerScraper
+from standin_server import StandInServer
+
+
+def main():
+    with StandInServer(asset_latency=0) as server:
+        pool = DriverPool(max_size=1, capture_network=True)
+        try:
+            print(f"{'mode':<9}{'page':<11}{'seconds':>9}{'holdings':>10}{'trades':>8}{'history':>9}")
+            for mode in ('dom', 'network'):
+                scraper = PelosiTrackerScraper(driver_pool=pool, scrape_mode=mode)
+                scraper.base_url = server.url
+
+                start = time.time()
+                portfolio = scraper.get_portfolio_data() or {}
+                print(f"{mode:<9}{'portfolio':<11}{time.time() - start:>9.2f}"
+                      f"{len(portfolio.get('holdings', [])):>10}{len(portfolio.get('recent_trades', [])):>8}"
+                      f"{len(portfolio.get('historical_performance', [])):>9}")
+
+                start = time.time()
+                stock = scraper.get_stock_data('NVDA') or {}
+                print(f"{mode:<9}{'stock':<11}{time.time() - start:>9.2f}{'':>10}"
+                      f"{len(stock.get('trades', [])):>8}{len(stock.get('price_history', [])):>9}")
+        finally:
+            pool.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Requests, bytes and time-to-render for the profile page's data
+"before" issues the requests profile.js used to make on load (three identical
+/api/portfolio fetches plus the quote, S&P 500 comparison and predictions), up to
+six at a time like a browser on HTTP/1.1; "after" issues the single
+/api/profile-bundle request. Time-to-render is when the last section's data has
+arrived. --rtt-ms adds one simulated network round trip per request.
+
+Usage: python benchmarks/profile_page.py [--loads 50] [--rtt-ms 50]
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import make_server
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as tracker
+
+BEFORE = ['/api/portfolio', '/api/portfolio', '/api/portfolio', '/api/nancy-quote',
+          '/api/sp500-comparison?points=120', '/api/trade-predictions']
+AFTER = ['/api/profile-bundle/nancy?points=120']
+BROWSER_CONNECTIONS = 6
+
+
+def fetch(url: str, rtt: float) -> int:
+    """Bytes received for one gzip-accepting GET"""
+    time.sleep(rtt)
+    request = urllib.request.Request(url, headers={'Accept-Encoding': 'gzip'})
+    with urllib.request.urlopen(request) as response:
+        return len(response.read())
+
+
+def page_load(base_url: str, paths, rtt: float):
+    """(bytes, seconds until every response has arrived)"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=BROWSER_CONNECTIONS) as pool:
+        sizes = list(pool.map(lambda path: fetch(base_url + path, rtt), paths))
+    return sum(sizes), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--loads', type=int, default=50)
+    parser.add_argument('--rtt-ms', type=float, default=50)
+    args = parser.parse_args()
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, tracker.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        print(f"{'variant':<9}{'requests':>9}{'bytes':>9}{'median ms':>11}{'p90 ms':>9}")
+        for label, paths in (('before', BEFORE), ('after', AFTER)):
+            page_load(base_url, paths, 0)  # warm the response cache
+            loads = [page_load(base_url, paths, args.rtt_ms / 1000) for _ in range(args.loads)]
+            times = sorted(seconds * 1000 for _, seconds in loads)
+            print(f"{label:<9}{len(paths):>9}{loads[0][0]:>9,}{statistics.median(times):>11.1f}"
+                  f"{times[int(len(times) * 0.9) - 1]:>9.1f}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
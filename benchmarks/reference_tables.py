@@ -0,0 +1,74 @@
+"""
+Per-lookup allocations and time: rebuilding a dict literal vs the load-once tables
+"before" evaluates the same literal the handlers used to build on every request and
+reads one key from it; "after" reads the key from the prebuilt read-only table.
+
+Usage: python benchmarks/reference_tables.py [--lookups 20000]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from types import MappingProxyType
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as tracker
+
+
+def thaw(value):
+    """Plain dict/list copy of a reference table, so repr() gives back the original literal"""
+    if isinstance(value, MappingProxyType):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def allocated_per_call(fn, calls: int = 200) -> float:
+    """Peak bytes held above the starting point during one call, averaged over calls"""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    peak_total = 0
+    for _ in range(calls):
+        tracemalloc.reset_peak()
+        fn()
+        peak_total += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return peak_total / calls
+
+
+def seconds_per_call(fn, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lookups', type=int, default=20000)
+    args = parser.parse_args()
+
+    tables = [
+        ('profiles_info', tracker.PROFILES_INFO, 'tommy-tuberville'),
+        ('profiles_data', tracker.PROFILE_PORTFOLIOS, 'dan-crenshaw'),
+        ('stock_info', tracker.STOCK_INFO, 'NVDA'),
+    ]
+    print(f"{'table':<15}{'variant':<9}{'peak bytes':>14}{'us/lookup':>11}")
+    for name, table, key in tables:
+        literal = compile(repr(thaw(table)), f'<{name}>', 'eval')
+        variants = [
+            ('before', lambda: eval(literal).get(key)),
+            ('after', lambda: table.get(key)),
+        ]
+        for label, fn in variants:
+            allocated = allocated_per_call(fn)
+            elapsed = seconds_per_call(fn, args.lookups)
+            print(f"{name:<15}{label:<9}{allocated:>14,.0f}{elapsed * 1e6:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Page-load time and bytes transferred with and without the scraper's URL blocking profiles
+Loads the stand-in portfolio and stock pages through a DriverPool per profile and
+waits on the same readiness conditions the scraper uses.
+
+Usage: python benchmarks/resource_blocking.py [--runs 5] [--profiles none,default,aggressive]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper import (BLOCKING_PROFILES, HOLDINGS_HEADER_KEYWORDS, DriverPool, PageReadiness,
+                     table_has_rows, trading_activity_populated)
+from standin_server import StandInServer
+
+PAGES = [
+    ('portfolio', '/portfolios/nancy-pelosi', table_has_rows(HOLDINGS_HEADER_KEYWORDS)),
+    ('stock', '/stock/nvda', trading_activity_populated()),
+]
+
+
+def measure(server: StandInServer, profile: str, runs: int):
+    """Median ready time, load-event time and server bytes per page for one profile"""
+    pool = DriverPool(max_size=1, blocked_urls=BLOCKING_PROFILES[profile])
+    results = []
+    try:
+        with pool.session() as driver:
+            # Warm-up load so browser start-up is not counted
+            driver.get(server.url + PAGES[0][1])
+            for page, path, condition in PAGES:
+                ready, loaded, sent = [], [], []
+                for _ in range(runs):
+                    driver.get('about:blank')
+                    server.reset_stats()
+                    start = time.time()
+                    driver.get(server.url + path)
+                    PageReadiness(driver, page, budget=30, poll=0.01).wait_for('ready', condition)
+                    ready.append(time.time() - start)
+                    loaded.append(driver.execute_script(
+                        "var t = performance.getEntriesByType('navigation')[0]; return t ? t.loadEventEnd : 0") / 1000)
+                    sent.append(server.bytes_sent)
+                results.append((page, statistics.median(ready), statistics.median(loaded), statistics.median(sent)))
+    finally:
+        pool.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--profiles', default='none,default,aggressive')
+    parser.add_argument('--asset-latency', type=float, default=0.05, help='seconds added to every asset response')
+    args = parser.parse_args()
+
+    with StandInServer(asset_latency=args.asset_latency) as server:
+        print(f"{'profile':<12}{'page':<11}{'ready (s)':>10}{'load (s)':>10}{'bytes':>12}")
+        for profile in args.profiles.split(','):
+            for page, ready, loaded, sent in measure(server, profile, args.runs):
+                print(f"{profile:<12}{page:<11}{ready:>10.3f}{loaded:>10.3f}{sent:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""
+Local stand-in for pelositracker.app used by the scraper benchmarks
+Serves recorded page and JSON fixtures from benchmarks/fixtures plus synthetic
+images, fonts, video and tracker scripts, and counts the bytes it sends.
+"""
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Page routes -> fixture files (same paths the scraper requests on the real site)
+PAGE_ROUTES = {
+    '/portfolios/nancy-pelosi': 'portfolio.html',
+}
+STOCK_PAGE = 'stock.html'
+
+# Synthetic asset sizes by extension, roughly what the real site ships
+ASSET_SIZES = {
+    '.jpg': 180 * 1024,
+    '.png': 120 * 1024,
+    '.webp': 90 * 1024,
+    '.svg': 8 * 1024,
+    '.woff2': 70 * 1024,
+    '.css': 60 * 1024,
+    '.mp4': 1500 * 1024,
+    '.js': 45 * 1024,
+}
+
+CONTENT_TYPES = {
+    '.html': 'text/html; charset=utf-8',
+    '.json': 'application/json',
+    '.js': 'application/javascript',
+    '.css': 'text/css',
+    '.jpg': 'image/jpeg',
+    '.png': 'image/png',
+    '.webp': 'image/webp',
+    '.svg': 'image/svg+xml',
+    '.woff2': 'font/woff2',
+    '.mp4': 'video/mp4',
+}
+
+
+class StandInServer:
+    """Threaded HTTP server on 127.0.0.1 serving the fixtures; use as a context manager"""
+
+    def __init__(self, port: int = 0, asset_latency: float = 0.05, fixtures_dir: str = FIXTURES_DIR):
+        self.asset_latency = asset_latency
+        self.fixtures_dir = fixtures_dir
+        self.bytes_sent = 0
+        self.requests: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_stats(self):
+        with self._lock:
+            self.bytes_sent = 0
+            self.requests = {}
+
+    def _record(self, path: str, size: int):
+        with self._lock:
+            self.bytes_sent += size
+            self.requests[path] = self.requests.get(path, 0) + 1
+
+    def _resolve(self, path: str):
+        """Map a request path to (body, content_type, is_asset), or None for 404"""
+        path = path.split('?', 1)[0]
+        ext = os.path.splitext(path)[1].lower()
+
+        if path in PAGE_ROUTES:
+            return self._read(PAGE_ROUTES[path]), CONTENT_TYPES['.html'], False
+        if path.startswith('/stock/'):
+            return self._read(STOCK_PAGE), CONTENT_TYPES['.html'], False
+        if path.startswith('/api/'):
+            # /api/stock/nvda -> fixtures/api/stock-nvda.json
+            name = path[len('/api/'):].strip('/').replace('/', '-') + '.json'
+            body = self._read(os.path.join('api', name))
+            return (body, CONTENT_TYPES['.json'], False) if body is not None else None
+        if path.startswith('/static/'):
+            body = self._read(path[len('/static/'):])
+            return (body, CONTENT_TYPES.get(ext, 'application/octet-stream'), False) if body is not None else None
+        if ext in ASSET_SIZES:
+            # Images, fonts, video, stylesheets and third-party scripts are synthesized
+            filler = b'/* stand-in */\n' if ext in ('.js', '.css') else b'\0'
+            body = (filler * (ASSET_SIZES[ext] // len(filler) + 1))[:ASSET_SIZES[ext]]
+            return body, CONTENT_TYPES.get(ext, 'application/octet-stream'), True
+        return None
+
+    def _read(self, name: str) -> Optional[bytes]:
+        full = os.path.join(self.fixtures_dir, name)
+        if not os.path.isfile(full):
+            return None
+        with open(full, 'rb') as f:
+            return f.read()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                resolved = server._resolve(self.path)
+                if resolved is None:
+                    self.send_error(404)
+                    return
+                body, content_type, is_asset = resolved
+                if is_asset and server.asset_latency:
+                    time.sleep(server.asset_latency)
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Cache-Control', 'no-store')
+                self.end_headers()
+                self.wfile.write(body)
+                server._record(self.path, len(body))
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> 'StandInServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'StandInServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == '__main__':
+    with StandInServer(port=8765) as standin:
+        print(f"Stand-in pelositracker.app serving on {standin.url}", flush=True)
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,177 @@
+"""
+Vectorized option exposure: notional, moneyness, Black-Scholes value and greeks
+Works on the option_* columns a TradeStore parses at ingest. Positions are netted
+per contract (ticker, right, strike, expiry) and every open one is priced in a
+single NumPy pass against the holdings' last_price.
+"""
+from datetime import date
+from typing import Dict, List, Mapping, Optional
+
+import numpy as np
+
+from trade_store import BUY_ACTIONS, SELL_ACTIONS, TradeStore
+
+CONTRACT_MULTIPLIER = 100
+DEFAULT_RISK_FREE_RATE = 0.045
+DEFAULT_VOLATILITY = 0.40
+# Disclosures often omit the expiry; Pelosi's calls are typically ~1-year LEAPS
+ASSUMED_TENOR_DAYS = 365
+
+
+def norm_cdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal CDF via the Abramowitz-Stegun 7.1.26 erf approximation (|error| < 1.5e-7)"""
+    z = np.abs(x) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-z * z)
+    return 0.5 * (1.0 + np.sign(x) * erf)
+
+
+def norm_pdf(x: np.ndarray) -> np.ndarray:
+    return np.exp(-0.5 * x * x) / np.sqrt(2.0 * np.pi)
+
+
+def black_scholes(spot, strike, years, rate, vol, is_call) -> Dict[str, np.ndarray]:
+    """Per-share value and greeks; theta is per calendar day, vega and rho per 1 percentage point"""
+    sqrt_t = np.sqrt(years)
+    d1 = (np.log(spot / strike) + (rate + 0.5 * vol * vol) * years) / (vol * sqrt_t)
+    d2 = d1 - vol * sqrt_t
+    discount = np.exp(-rate * years)
+    pdf_d1 = norm_pdf(d1)
+
+    call_value = spot * norm_cdf(d1) - strike * discount * norm_cdf(d2)
+    put_value = strike * discount * norm_cdf(-d2) - spot * norm_cdf(-d1)
+    decay = -spot * pdf_d1 * vol / (2 * sqrt_t)
+    return {
+        'value': np.where(is_call, call_value, put_value),
+        'delta': np.where(is_call, norm_cdf(d1), norm_cdf(d1) - 1.0),
+        'gamma': pdf_d1 / (spot * vol * sqrt_t),
+        'theta': np.where(is_call, decay - rate * strike * discount * norm_cdf(d2),
+                          decay + rate * strike * discount * norm_cdf(-d2)) / 365.0,
+        'vega': spot * pdf_d1 * sqrt_t / 100.0,
+        'rho': np.where(is_call, strike * years * discount * norm_cdf(d2),
+                        -strike * years * discount * norm_cdf(-d2)) / 100.0,
+    }
+
+
+def options_exposure(store: TradeStore, prices: Mapping[str, float], as_of: Optional[int] = None,
+                     rate: float = DEFAULT_RISK_FREE_RATE, vol: float = DEFAULT_VOLATILITY) -> Dict:
+    """Open option positions valued as of the date ordinal as_of (default today)"""
+    as_of = as_of if as_of is not None else date.today().toordinal()
+    columns = store.columns()
+    result = {'as_of': date.fromordinal(as_of).isoformat(), 'risk_free_rate': rate, 'volatility': vol,
+              'positions': [], 'totals': {}}
+
+    right = np.asarray(columns['option_right'], dtype=object).astype(str)
+    action = np.asarray(columns['action'], dtype=object)
+    contracts = np.asarray(columns['option_contracts'], dtype=float)
+    strike = np.asarray(columns['option_strike'], dtype=float)
+    expiry = np.asarray(columns['option_expiry'], dtype=np.int64)
+    traded = np.asarray(columns['ordinal'], dtype=np.int64)
+    exercised = np.asarray(columns['option_exercised'], dtype=bool)
+
+    # Exercised contracts are no longer options; terms we cannot price are skipped
+    sign = np.where(np.isin(action, BUY_ACTIONS), 1.0, np.where(np.isin(action, SELL_ACTIONS), -1.0, 0.0))
+    usable = (right != '') & ~exercised & (contracts > 0) & ~np.isnan(strike) & (sign != 0)
+    if not usable.any():
+        return _with_totals(result)
+
+    rows = np.flatnonzero(usable)
+    ticker = np.asarray(columns['ticker'], dtype=object).astype(str)[rows]
+    right, strike, expiry, traded = right[rows], strike[rows], expiry[rows], traded[rows]
+    signed = (sign * contracts)[rows]
+
+    # Rows without a disclosed expiry are netted lot by lot, then join the disclosed ones as open lots
+    disclosed = expiry >= 0
+    lots = _assumed_expiry_lots(ticker[~disclosed], right[~disclosed], strike[~disclosed],
+                                traded[~disclosed], signed[~disclosed])
+    ticker, right, strike, expiry, signed = (np.concatenate([values[disclosed], lot_values]) for values, lot_values
+                                             in zip((ticker, right, strike, expiry, signed), lots))
+    expiry_assumed = np.arange(len(ticker)) >= disclosed.sum()
+    if not len(ticker):
+        return _with_totals(result)
+
+    # Net buys against sells per contract series
+    keys = np.stack([np.unique(ticker, return_inverse=True)[1], np.unique(right, return_inverse=True)[1],
+                     np.unique(strike, return_inverse=True)[1], np.unique(expiry, return_inverse=True)[1]], axis=1)
+    series, series_ids = np.unique(keys, axis=0, return_inverse=True)
+    series_ids = series_ids.reshape(-1)
+    net = np.bincount(series_ids, weights=signed, minlength=len(series))
+    first = np.full(len(series), len(series_ids), dtype=np.intp)
+    np.minimum.at(first, series_ids, np.arange(len(series_ids)))
+    assumed = np.bincount(series_ids, weights=expiry_assumed.astype(float), minlength=len(series)) > 0
+
+    spot = np.array([prices.get(t, np.nan) for t in ticker[first]], dtype=float)
+    open_ = (net > 0) & (expiry[first] > as_of) & ~np.isnan(spot)
+    if not open_.any():
+        return _with_totals(result)
+
+    first, net, spot, assumed = first[open_], net[open_], spot[open_], assumed[open_]
+    pos_strike, pos_expiry, pos_right = strike[first], expiry[first], right[first]
+    years = (pos_expiry - as_of) / 365.0
+    greeks = black_scholes(spot, pos_strike, years, rate, vol, pos_right == 'call')
+
+    shares = net * CONTRACT_MULTIPLIER
+    notional = shares * spot
+    delta_exposure = greeks['delta'] * notional
+    for i in range(len(first)):
+        result['positions'].append({
+            'ticker': str(ticker[first[i]]),
+            'right': str(pos_right[i]),
+            'strike': float(pos_strike[i]),
+            'expiry': date.fromordinal(int(pos_expiry[i])).isoformat(),
+            'expiry_assumed': bool(assumed[i]),
+            'contracts': int(net[i]),
+            'underlying_price': float(spot[i]),
+            'moneyness': round(float(spot[i] / pos_strike[i]), 4),
+            'years_to_expiry': round(float(years[i]), 4),
+            'notional': round(float(notional[i]), 2),
+            'value': round(float(greeks['value'][i] * shares[i]), 2),
+            'delta': round(float(greeks['delta'][i]), 4),
+            'gamma': round(float(greeks['gamma'][i]), 6),
+            'theta': round(float(greeks['theta'][i] * shares[i]), 2),
+            'vega': round(float(greeks['vega'][i] * shares[i]), 2),
+            'rho': round(float(greeks['rho'][i] * shares[i]), 2),
+            'delta_exposure': round(float(delta_exposure[i]), 2),
+        })
+    result['positions'].sort(key=lambda p: -abs(p['delta_exposure']))
+    return _with_totals(result)
+
+
+def _assumed_expiry_lots(ticker, right, strike, traded, signed):
+    """Open lots of option trades whose disclosure gave no expiry, as (ticker, right, strike, expiry,
+    contracts) arrays. Each dated purchase is a lot expiring ASSUMED_TENOR_DAYS after its trade date;
+    a sale closes the oldest lots of the same (ticker, right, strike) still open on the sale date."""
+    open_lots: Dict[tuple, List[List]] = {}
+    # Oldest first, purchases before sales on the same day
+    for i in np.lexsort((signed < 0, traded)):
+        if traded[i] < 0:
+            continue
+        lots = open_lots.setdefault((ticker[i], right[i], strike[i]), [])
+        if signed[i] > 0:
+            lots.append([traded[i] + ASSUMED_TENOR_DAYS, signed[i]])
+            continue
+        remaining = -signed[i]
+        for lot in lots:
+            if remaining <= 0:
+                break
+            if lot[0] > traded[i]:
+                closed = min(lot[1], remaining)
+                lot[1] -= closed
+                remaining -= closed
+
+    rows = [(key, expiry, count) for key, lots in open_lots.items() for expiry, count in lots if count > 0]
+    return (np.array([key[0] for key, _, _ in rows], dtype=str), np.array([key[1] for key, _, _ in rows], dtype=str),
+            np.array([key[2] for key, _, _ in rows], dtype=float), np.array([expiry for _, expiry, _ in rows], dtype=np.int64),
+            np.array([count for _, _, count in rows], dtype=float))
+
+
+def _with_totals(result: Dict) -> Dict:
+    positions = result['positions']
+    result['totals'] = {
+        'positions': len(positions),
+        'contracts': sum(p['contracts'] for p in positions),
+        **{field: round(sum(p[field] for p in positions), 2)
+           for field in ('notional', 'value', 'delta_exposure', 'theta', 'vega', 'rho')},
+    }
+    return result
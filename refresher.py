@@ -0,0 +1,160 @@
+"""
+Background portfolio refresh with stale-while-revalidate serving
+The scraper runs on a schedule off the request path; handlers always get the
+last good portfolio immediately, along with how old it is.
+"""
+import threading
+import time
+import traceback
+import uuid
+from collections import deque
+from typing import Callable, Dict, Optional
+
+import schedule
+
+from snapshots import PortfolioSnapshot
+
+
+class PortfolioRefresher:
+    """Holds the last good portfolio and refreshes it in the background.
+
+    current() never blocks on a scrape. A failed or empty scrape keeps the
+    previous data; a partial one only replaces the sections it actually found.
+    Each successful refresh publishes a new PortfolioSnapshot with the next version.
+    Request-driven refreshes (refresh_if_due) back off after an attempt, doubling the
+    wait while scrapes keep failing, so stale data never turns traffic into scrapes.
+    """
+
+    def __init__(self, fetch: Callable[[], Optional[Dict]], initial: Dict, interval_minutes: float = 30,
+                 stale_after_seconds: Optional[float] = None, history: int = 8,
+                 retry_after_seconds: float = 60):
+        self.fetch = fetch
+        self.interval_minutes = interval_minutes
+        self.stale_after_seconds = stale_after_seconds if stale_after_seconds is not None else interval_minutes * 60
+        self.retry_after_seconds = retry_after_seconds
+        # Versions count from 1 in every process; the epoch tells one process's sequence from another's
+        self.epoch = uuid.uuid4().hex[:12]
+        # Replaced wholesale by one assignment; readers grab the reference once per request
+        self._current = PortfolioSnapshot.build(initial, version=1)
+        # The last few published snapshots, oldest first, for answering deltas
+        self._recent = deque([self._current], maxlen=max(history, 1))
+        self._refresh_lock = threading.Lock()
+        # Notified on every publish so push subscribers wake up instead of polling
+        self._published = threading.Condition()
+        self._scheduler = schedule.Scheduler()
+        self._thread: Optional[threading.Thread] = None
+        self.last_error: Optional[str] = None
+        # When the last refresh attempt finished, and how many in a row have failed
+        self.last_attempt: Optional[float] = None
+        self._failures = 0
+
+    def current(self) -> PortfolioSnapshot:
+        """Last good portfolio snapshot"""
+        return self._current
+
+    def snapshot(self, version: int) -> Optional[PortfolioSnapshot]:
+        """A recently published snapshot by version, or None once it has left the history ring"""
+        for snapshot in tuple(self._recent):
+            if snapshot.version == version:
+                return snapshot
+        return None
+
+    def age_seconds(self) -> float:
+        return time.time() - self._current.fetched_at
+
+    def is_stale(self) -> bool:
+        return self.age_seconds() > self.stale_after_seconds
+
+    def is_refreshing(self) -> bool:
+        return self._refresh_lock.locked()
+
+    def next_attempt_at(self) -> float:
+        """Earliest time refresh_if_due() may start another attempt"""
+        if self.last_attempt is None:
+            return 0.0
+        ceiling = max(self.stale_after_seconds, self.retry_after_seconds)
+        return self.last_attempt + min(self.retry_after_seconds * 2 ** self._failures, ceiling)
+
+    def refresh_if_due(self) -> bool:
+        """Start a background refresh if the data is stale and the retry backoff has passed"""
+        if not self.is_stale() or time.time() < self.next_attempt_at():
+            return False
+        return self.refresh_async()
+
+    def wait_for_version(self, after: int, timeout: Optional[float] = None) -> PortfolioSnapshot:
+        """Block until a snapshot newer than version `after` is published or timeout passes;
+        returns the current snapshot either way"""
+        with self._published:
+            self._published.wait_for(lambda: self._current.version > after, timeout)
+            return self._current
+
+    def refresh_async(self) -> bool:
+        """Start a refresh in a daemon thread; returns False if one is already running"""
+        if not self._refresh_lock.acquire(blocking=False):
+            return False
+        thread = threading.Thread(target=self._refresh_locked, name='portfolio-refresh', daemon=True)
+        thread.start()
+        return True
+
+    def refresh(self) -> bool:
+        """Refresh synchronously; returns True if new data was published"""
+        with self._refresh_lock:
+            return self._refresh()
+
+    def _refresh_locked(self):
+        try:
+            self._refresh()
+        finally:
+            self._refresh_lock.release()
+
+    def _refresh(self) -> bool:
+        try:
+            published = self._attempt()
+        finally:
+            self.last_attempt = time.time()
+        self._failures = 0 if published else self._failures + 1
+        return published
+
+    def _attempt(self) -> bool:
+        start = time.time()
+        print("Background refresh started", flush=True)
+        try:
+            fresh = self.fetch()
+        except Exception as e:
+            traceback.print_exc()
+            fresh = None
+            self.last_error = str(e)
+
+        if not fresh or not fresh.get('holdings'):
+            print(f"Background refresh returned no data after {time.time() - start:.1f}s, keeping last good portfolio", flush=True)
+            if fresh is not None:
+                self.last_error = 'scrape returned no holdings'
+            return False
+
+        previous = self._current
+        merged = dict(previous.portfolio)
+        for key, value in fresh.items():
+            if value:
+                merged[key] = value
+        snapshot = previous.next(merged)
+        with self._published:
+            self._recent.append(snapshot)
+            self._current = snapshot
+            self._published.notify_all()
+        self.last_error = None
+        print(f"Background refresh published portfolio v{snapshot.version} in {time.time() - start:.1f}s", flush=True)
+        return True
+
+    def start(self):
+        """Run the refresh schedule in a daemon thread"""
+        if self._thread is not None or self.interval_minutes <= 0:
+            return
+        self._scheduler.every(self.interval_minutes).minutes.do(self.refresh_async)
+        self._thread = threading.Thread(target=self._run_schedule, name='portfolio-scheduler', daemon=True)
+        self._thread.start()
+        print(f"Background refresh scheduled every {self.interval_minutes:g} minutes", flush=True)
+
+    def _run_schedule(self):
+        while True:
+            self._scheduler.run_pending()
+            time.sleep(1)
@@ -0,0 +1,173 @@
+"""
+Pre-encoded, pre-compressed response bodies
+Canonical API payloads are encoded and compressed once per data version and static
+assets once per file build; each request only negotiates which stored variant to
+send. Parameterized variants are compressed at a fast level, per encoding, the first
+time a client asks for that encoding.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from flask import Response, request, send_from_directory
+from werkzeug.exceptions import NotFound
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Server preference order when the client accepts several encodings equally
+ENCODINGS = ('br', 'gzip') if BROTLI_AVAILABLE else ('gzip',)
+
+# Bodies smaller than this are not worth a Content-Encoding header
+MIN_COMPRESS_BYTES = 1024
+
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.html', '.json', '.svg', '.txt', '.map'}
+
+
+# Maximum compression for bodies compressed once and served many times; gzip 6 and brotli 5
+# cost well under a millisecond on a typical payload, where gzip 9 and brotli 11 cost tens
+MAX_LEVELS = {'gzip': 9, 'br': 11}
+FAST_LEVELS = {'gzip': 6, 'br': 5}
+
+
+def compress(body: bytes, encoding: str, level: int) -> Optional[bytes]:
+    """body in one encoding, or None when that does not save bytes"""
+    if encoding == 'br':
+        data = brotli.compress(body, quality=level)
+    else:
+        data = gzip.compress(body, compresslevel=level, mtime=0)
+    return data if len(data) < len(body) else None
+
+
+def compress_variants(body: bytes) -> Dict[str, bytes]:
+    """Every supported encoding of body, at maximum compression since it is done once"""
+    if len(body) < MIN_COMPRESS_BYTES:
+        return {}
+    variants = {encoding: compress(body, encoding, MAX_LEVELS[encoding]) for encoding in ENCODINGS}
+    # Keep only variants that actually save bytes
+    return {encoding: data for encoding, data in variants.items() if data is not None}
+
+
+@dataclass(frozen=True)
+class EncodedResponse:
+    """Encoded body, its compressed variants and the strong ETag derived from it.
+
+    With on_demand, variants starts empty and each encoding is compressed at
+    FAST_LEVELS when first negotiated; an encoding that does not save bytes is
+    stored as None and answered with the identity body.
+    """
+    body: bytes
+    etag: str
+    mimetype: str = 'application/json'
+    variants: Dict[str, Optional[bytes]] = field(default_factory=dict)
+    on_demand: bool = False
+
+    @classmethod
+    def from_body(cls, body: bytes, mimetype: str = 'application/json', on_demand: bool = False) -> 'EncodedResponse':
+        # Content hash rather than the version number: versions restart at 1 with the process
+        return cls(body=body, etag=hashlib.sha256(body).hexdigest()[:32], mimetype=mimetype,
+                   variants={} if on_demand else compress_variants(body), on_demand=on_demand)
+
+    @property
+    def compressible(self) -> bool:
+        """Whether the representation depends on Accept-Encoding"""
+        return len(self.body) >= MIN_COMPRESS_BYTES if self.on_demand else bool(self.variants)
+
+    def negotiate(self) -> Tuple[Optional[str], bytes]:
+        """(content_encoding, bytes) best matching the request's Accept-Encoding"""
+        if not self.compressible:
+            return None, self.body
+        offered = ENCODINGS if self.on_demand else [e for e in ENCODINGS if e in self.variants]
+        encoding = request.accept_encodings.best_match(offered)
+        if encoding is None:
+            return None, self.body
+        if encoding not in self.variants:
+            # Racing requests compress the same bytes; the last assignment wins harmlessly
+            self.variants[encoding] = compress(self.body, encoding, FAST_LEVELS[encoding])
+        data = self.variants[encoding]
+        return (encoding, data) if data is not None else (None, self.body)
+
+
+class ResponseCache:
+    """Small LRU of encoded responses keyed by (name, version).
+    on_demand caches compress each entry lazily at a fast level (see EncodedResponse)."""
+
+    def __init__(self, max_entries: int = 64, on_demand: bool = False):
+        self.max_entries = max_entries
+        self.on_demand = on_demand
+        self._entries: 'OrderedDict[Hashable, EncodedResponse]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, encode: Callable[[], bytes], mimetype: str = 'application/json') -> EncodedResponse:
+        """Cached response for key, encoding and compressing it with encode() on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        # Encode outside the lock; two threads racing on a miss just produce the same bytes
+        entry = EncodedResponse.from_body(encode(), mimetype, self.on_demand)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+
+def conditional_response(entry: EncodedResponse) -> Response:
+    """200 with the best stored variant, or 304 when the client already has it"""
+    encoding, body = entry.negotiate()
+    # Each representation gets its own strong ETag
+    etag = f"{entry.etag}-{encoding}" if encoding else entry.etag
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype=entry.mimetype)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    if entry.compressible:
+        response.vary.add('Accept-Encoding')
+    # Let browsers keep the body but revalidate every time
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+# Static assets: one entry per (path, mtime, size), so an edited file is recompressed once
+static_cache = ResponseCache(max_entries=128)
+
+
+def send_static_compressed(static_folder: str, filename: str) -> Response:
+    """Serve a static file from its precompressed variants; binary files go through send_from_directory"""
+    ext = os.path.splitext(filename)[1].lower()
+    path = safe_join(static_folder, filename)
+    if ext not in COMPRESSIBLE_EXTENSIONS or path is None or not os.path.isfile(path):
+        return send_from_directory(static_folder, filename)
+
+    try:
+        stat = os.stat(path)
+    except OSError:
+        raise NotFound()
+
+    def read():
+        with open(path, 'rb') as f:
+            return f.read()
+
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    entry = static_cache.get((path, stat.st_mtime_ns, stat.st_size), read, mimetype)
+    return conditional_response(entry)
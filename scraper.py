@@ -1,9 +1,15 @@
 import requests
 from bs4 import BeautifulSoup
+import atexit
+import base64
 import json
+import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 import time
 
 # Try to use Selenium if available
@@ -17,11 +23,563 @@ try:
 except ImportError:
     SELENIUM_AVAILABLE = False
 
+# psutil gives real browser RSS for the pool's memory ceiling; without it we fall back to the JS heap size
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# URL patterns dropped via CDP Network.setBlockedURLs - the extractors only need the DOM and data scripts
+_BLOCK_MEDIA = ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+                '*.mp4', '*.webm', '*.mov', '*.m3u8', '*.mp3']
+_BLOCK_FONTS = ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot', '*fonts.googleapis.com*', '*fonts.gstatic.com*']
+_BLOCK_TRACKERS = ['*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*facebook.net*',
+                   '*hotjar.com*', '*segment.io*', '*segment.com*', '*mixpanel.com*', '*clarity.ms*',
+                   '*plausible.io*', '*posthog.com*', '*sentry.io*', '*intercom.io*']
+
+BLOCKING_PROFILES = {
+    'none': [],
+    'default': _BLOCK_MEDIA + _BLOCK_FONTS + _BLOCK_TRACKERS,
+    # Stylesheets change what innerText returns for hidden elements, so they are only dropped here
+    'aggressive': _BLOCK_MEDIA + _BLOCK_FONTS + _BLOCK_TRACKERS + ['*.css'],
+}
+
+SCRAPE_BLOCKING_PROFILE = os.environ.get('SCRAPE_BLOCKING_PROFILE', 'default')
+
+# 'dom' walks the rendered page; 'network' maps the JSON feeds the page fetches and walks the DOM only for gaps
+SCRAPE_MODE = os.environ.get('SCRAPE_MODE', 'dom')
+
+# Chrome instances the shared pool may run at once; this also bounds batch scrape parallelism.
+# Browsers start on demand, so single-page scrapes still run one.
+SCRAPE_POOL_SIZE = int(os.environ.get('SCRAPE_POOL_SIZE', '4'))
+
+# Chrome (or chrome-headless-shell) to launch instead of the one Selenium finds on its own
+SCRAPE_CHROME_BINARY = os.environ.get('SCRAPE_CHROME_BINARY')
+
+
+def build_chrome_options(user_agent: str = DEFAULT_USER_AGENT) -> 'Options':
+    """Headless Chrome options shared by every scrape session"""
+    options = Options()
+    if SCRAPE_CHROME_BINARY:
+        options.binary_location = SCRAPE_CHROME_BINARY
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--window-size=1920,1080')
+    options.add_argument('--disable-logging')
+    options.add_argument('--log-level=3')
+    options.add_argument(f'user-agent={user_agent}')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    return options
+
+
+class DriverPool:
+    """Bounded pool of reusable Chrome drivers.
+
+    Drivers are checked out with acquire()/release() (or the session() context
+    manager), health-checked on checkout, and recycled once they have served
+    max_pages pages or grown past max_memory_mb.
+    """
+
+    def __init__(self, options_factory: Callable[[], 'Options'] = build_chrome_options, max_size: int = 2,
+                 max_pages: int = 25, max_memory_mb: int = 1024, page_load_timeout: int = 30,
+                 blocked_urls: Optional[List[str]] = None, capture_network: bool = False):
+        self.options_factory = options_factory
+        self.blocked_urls = list(blocked_urls or [])
+        self.capture_network = capture_network
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.page_load_timeout = page_load_timeout
+        self._idle = []
+        self._pages = {}
+        self._created = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def _create_driver(self):
+        """Start a new Chrome instance for the pool"""
+        start = time.time()
+        options = self.options_factory()
+        if self.capture_network:
+            # Network events go to the performance log so NetworkCapture can find the page's JSON feeds
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+            options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+        driver = webdriver.Chrome(options=options)
+        driver.set_page_load_timeout(self.page_load_timeout)
+        if self.blocked_urls:
+            # Network settings stick to the tab, so one call covers every page this driver loads
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked_urls})
+        print(f"Driver pool: started Chrome in {time.time() - start:.1f}s", flush=True)
+        return driver
+
+    def is_healthy(self, driver) -> bool:
+        """Cheap liveness probe - one round-trip to the browser"""
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _memory_mb(self, driver) -> float:
+        """Resident memory of the browser process tree, or JS heap size without psutil"""
+        try:
+            if PSUTIL_AVAILABLE:
+                process = psutil.Process(driver.service.process.pid)
+                processes = [process] + process.children(recursive=True)
+                return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+            heap = driver.execute_script("return (window.performance && performance.memory) ? performance.memory.usedJSHeapSize : 0")
+            return (heap or 0) / (1024 * 1024)
+        except Exception:
+            return 0.0
+
+    def _discard(self, driver):
+        """Quit a driver and free its slot"""
+        self._pages.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self._cond:
+            self._created -= 1
+            self._cond.notify()
+
+    def acquire(self, timeout: Optional[float] = None):
+        """Check a healthy driver out of the pool, starting one if there is room"""
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("Driver pool is closed")
+                if self._idle:
+                    driver = self._idle.pop()
+                elif self._created < self.max_size:
+                    self._created += 1
+                    driver = None
+                else:
+                    remaining = None if deadline is None else deadline - time.time()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError("Timed out waiting for a pooled Chrome driver")
+                    self._cond.wait(remaining)
+                    continue
+
+            if driver is None:
+                try:
+                    driver = self._create_driver()
+                except Exception:
+                    with self._cond:
+                        self._created -= 1
+                        self._cond.notify()
+                    raise
+                self._pages[id(driver)] = 0
+                return driver
+
+            if self.is_healthy(driver):
+                return driver
+            print("Driver pool: discarding unhealthy driver", flush=True)
+            self._discard(driver)
+
+    def release(self, driver, broken: bool = False):
+        """Return a driver to the pool, recycling it when it is worn out"""
+        pages = self._pages.get(id(driver), 0) + 1
+        self._pages[id(driver)] = pages
+
+        if broken or self._closed:
+            self._discard(driver)
+            return
+        if self.capture_network:
+            # Drain the performance log so entries do not pile up between pages
+            try:
+                driver.get_log('performance')
+            except Exception:
+                pass
+        if pages >= self.max_pages:
+            print(f"Driver pool: recycling driver after {pages} pages", flush=True)
+            self._discard(driver)
+            return
+        memory = self._memory_mb(driver)
+        if memory > self.max_memory_mb:
+            print(f"Driver pool: recycling driver at {memory:.0f} MB", flush=True)
+            self._discard(driver)
+            return
+
+        with self._cond:
+            self._idle.append(driver)
+            self._cond.notify()
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None):
+        """Context manager around acquire()/release()"""
+        driver = self.acquire(timeout)
+        broken = False
+        try:
+            yield driver
+        except Exception:
+            broken = not self.is_healthy(driver)
+            raise
+        finally:
+            self.release(driver, broken=broken)
+
+    def close(self):
+        """Quit every idle driver; checked-out drivers are quit when released"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._discard(driver)
+
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_driver_pool() -> DriverPool:
+    """Process-wide driver pool, created on first use"""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = DriverPool(max_size=SCRAPE_POOL_SIZE,
+                                      blocked_urls=BLOCKING_PROFILES.get(SCRAPE_BLOCKING_PROFILE, BLOCKING_PROFILES['default']),
+                                      capture_network=SCRAPE_MODE == 'network')
+            atexit.register(_shared_pool.close)
+        return _shared_pool
+
+
+# Total seconds a page may spend waiting for readiness before we extract whatever is there
+PAGE_WAIT_BUDGETS = {
+    'portfolio': 20.0,
+    'stock': 25.0,
+}
+
+HOLDINGS_HEADER_KEYWORDS = ['ticker', 'price', 'weight', 'holding', 'last price']
+TRADES_HEADER_KEYWORDS = ['politician', 'traded']
+
+# Serializes every table on the page (headers, row/cell text, links) in one WebDriver round-trip
+TABLE_SNAPSHOT_SCRIPT = """
+    var xpath = "//*[contains(text(), 'Congressional Trading Activity')]/following::table[1]";
+    var activity = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    function text(el) {
+        return ((el.innerText || '').trim() || (el.textContent || '').trim());
+    }
+    return Array.prototype.map.call(document.querySelectorAll('table'), function (table) {
+        var headers = Array.prototype.map.call(table.querySelectorAll('th'), text);
+        var rows = Array.prototype.map.call(table.querySelectorAll('tr'), function (row) {
+            var cells = row.querySelectorAll('td');
+            if (cells.length === 0) cells = row.querySelectorAll('th');
+            return {
+                cells: Array.prototype.map.call(cells, text),
+                links: Array.prototype.map.call(row.querySelectorAll('a[href]'), function (a) { return a.href; }),
+                text: text(row)
+            };
+        });
+        return {
+            headers: headers,
+            rows: rows,
+            trading_activity: table === activity,
+            mentions_pelosi: (table.textContent || '').indexOf('Pelosi') !== -1
+        };
+    });
+"""
+
+
+def table_has_rows(header_keywords: List[str], min_rows: int = 1) -> Callable:
+    """Ready when a table whose headers mention one of header_keywords has min_rows data rows"""
+    script = """
+        var keywords = arguments[0], minRows = arguments[1];
+        var tables = document.querySelectorAll('table');
+        for (var i = 0; i < tables.length; i++) {
+            var headers = Array.prototype.map.call(tables[i].querySelectorAll('th'), function (th) {
+                return (th.textContent || '').toLowerCase();
+            }).join(' ');
+            if (!keywords.some(function (k) { return headers.indexOf(k) !== -1; })) continue;
+            var hasCells = tables[i].querySelector('tr td') !== null;
+            if (hasCells && tables[i].querySelectorAll('tr').length - 1 >= minRows) return true;
+        }
+        return false;
+    """
+    return lambda driver: driver.execute_script(script, header_keywords, min_rows)
+
+
+def trading_activity_populated(min_rows: int = 1) -> Callable:
+    """Ready when the table after the 'Congressional Trading Activity' heading has data rows"""
+    script = """
+        var minRows = arguments[0];
+        var xpath = "//*[contains(text(), 'Congressional Trading Activity')]/following::table[1]";
+        var table = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        return !!table && table.querySelectorAll('tr td').length > 0 && table.querySelectorAll('tr').length - 1 >= minRows;
+    """
+    return lambda driver: driver.execute_script(script, min_rows)
+
+
+def element_present(tag: str) -> Callable:
+    """Ready when at least one element with this tag exists"""
+    return lambda driver: driver.execute_script("return document.getElementsByTagName(arguments[0]).length > 0", tag)
+
+
+def text_matches(pattern: str) -> Callable:
+    """Ready when the rendered body text matches a JS regular expression"""
+    return lambda driver: driver.execute_script(
+        "return !!document.body && new RegExp(arguments[0]).test(document.body.innerText)", pattern)
+
+
+def network_idle(quiet_ms: int = 500) -> Callable:
+    """Ready when the document is complete and no new resources were fetched for quiet_ms"""
+    state = {'count': -1, 'since': 0.0}
+
+    def check(driver):
+        count = driver.execute_script(
+            "return document.readyState === 'complete' ? performance.getEntriesByType('resource').length : -1")
+        now = time.time()
+        if count < 0 or count != state['count']:
+            state['count'] = count
+            state['since'] = now
+            return False
+        return (now - state['since']) * 1000 >= quiet_ms
+
+    return check
+
+
+class PageReadiness:
+    """Condition-based waits for one page load, sharing a single time budget.
+
+    Each wait_for() call polls a readiness condition until it holds or the
+    remaining budget runs out, and records how long it actually waited.
+    """
+
+    def __init__(self, driver, page: str, budget: Optional[float] = None, poll: float = 0.2):
+        self.driver = driver
+        self.page = page
+        self.budget = budget if budget is not None else PAGE_WAIT_BUDGETS.get(page, 20.0)
+        self.poll = poll
+        self.started = time.time()
+        self.timings = []
+
+    def remaining(self) -> float:
+        """Seconds left in this page's budget"""
+        return max(0.0, self.budget - (time.time() - self.started))
+
+    def wait_for(self, name: str, condition: Callable, timeout: Optional[float] = None) -> bool:
+        """Wait until condition(driver) is truthy; returns False on timeout instead of raising"""
+        limit = self.remaining() if timeout is None else min(timeout, self.remaining())
+        start = time.time()
+        ready = False
+        if limit > 0:
+            try:
+                WebDriverWait(self.driver, limit, poll_frequency=self.poll).until(condition)
+                ready = True
+            except Exception:
+                ready = False
+        elapsed = time.time() - start
+        self.timings.append({'condition': name, 'seconds': round(elapsed, 3), 'ready': ready})
+        print(f"[{self.page}] wait '{name}': {'ready' if ready else 'timed out'} after {elapsed:.2f}s", flush=True)
+        return ready
+
+    def summary(self) -> Dict:
+        """Wait timings for this page, for logging and diagnostics"""
+        return {
+            'page': self.page,
+            'budget': self.budget,
+            'total_seconds': round(time.time() - self.started, 3),
+            'waits': self.timings
+        }
+
+
+class NetworkCapture:
+    """JSON responses a page fetched, read from Chrome's performance log.
+
+    Create it before driver.get() so entries from earlier pages are discarded,
+    then call json_responses() once the page is ready.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.available = True
+        try:
+            driver.get_log('performance')
+        except Exception:
+            # Driver was started without performance logging
+            self.available = False
+
+    def json_responses(self) -> List[Tuple[str, object]]:
+        """(url, parsed body) for every JSON response received since construction"""
+        if not self.available:
+            return []
+        try:
+            entries = self.driver.get_log('performance')
+        except Exception as e:
+            print(f"Could not read performance log: {e}", flush=True)
+            return []
+        responses = []
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+                if message.get('method') != 'Network.responseReceived':
+                    continue
+                params = message['params']
+                response = params['response']
+                if 'json' not in response.get('mimeType', '').lower():
+                    continue
+                body = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': params['requestId']})
+                text = body['body']
+                if body.get('base64Encoded'):
+                    text = base64.b64decode(text).decode('utf-8')
+                responses.append((response['url'], json.loads(text)))
+            except Exception as e:
+                print(f"Skipping captured response: {e}", flush=True)
+        print(f"Captured {len(responses)} JSON responses", flush=True)
+        return responses
+
+
+def _field(record: Dict, *names):
+    """First present value among names, matching keys case- and underscore-insensitively"""
+    normalized = {str(k).replace('_', '').lower(): v for k, v in record.items()}
+    for name in names:
+        value = normalized.get(name.replace('_', '').lower())
+        if value not in (None, ''):
+            return value
+    return None
+
+
+def _record_lists(data) -> List[List[Dict]]:
+    """Every list of objects anywhere inside a JSON document"""
+    found = []
+    if isinstance(data, list):
+        if data and all(isinstance(item, dict) for item in data):
+            found.append(data)
+        for item in data:
+            found.extend(_record_lists(item))
+    elif isinstance(data, dict):
+        for value in data.values():
+            found.extend(_record_lists(value))
+    return found
+
+
+def _display_date(value) -> Optional[str]:
+    """ISO dates from JSON feeds in the m/d/yyyy form the rest of the app uses"""
+    if not value:
+        return None
+    text = str(value)
+    match = re.match(r'^(\d{4})-(\d{2})-(\d{2})', text)
+    if match:
+        return f"{int(match.group(2))}/{int(match.group(3))}/{match.group(1)}"
+    return text
+
+
+TICKER_FIELDS = ('ticker', 'symbol')
+PRICE_FIELDS = ('last_price', 'lastPrice', 'price', 'currentPrice', 'close')
+WEIGHT_FIELDS = ('weight', 'portfolioWeight', 'allocation', 'percent')
+ACTION_FIELDS = ('action', 'transactionType', 'transaction', 'side')
+TRADE_DATE_FIELDS = ('traded_date', 'tradeDate', 'transactionDate', 'date')
+FILED_DATE_FIELDS = ('filed_date', 'filedDate', 'disclosureDate', 'filingDate')
+AMOUNT_FIELDS = ('amount', 'amountRange', 'amount_range', 'value')
+ASSET_TYPE_FIELDS = ('type', 'assetType', 'instrument')
+VALUE_FIELDS = ('value', 'portfolioValue', 'total', 'nav')
+
+
+def map_captured_portfolio(responses: List[Tuple[str, object]]) -> Dict:
+    """Map captured JSON feeds onto holdings, recent_trades and historical_performance.
+
+    Only the keys that could be found are returned, so callers can fall back to
+    DOM extraction for the rest.
+    """
+    mapped = {}
+    for url, data in responses:
+        for records in _record_lists(data):
+            sample = records[0]
+            ticker = _field(sample, *TICKER_FIELDS)
+            has_date = _field(sample, *TRADE_DATE_FIELDS) is not None
+            
+            if ticker and _field(sample, *ACTION_FIELDS) and has_date and 'recent_trades' not in mapped:
+                mapped['recent_trades'] = [{
+                    'ticker': str(_field(r, *TICKER_FIELDS)).upper(),
+                    'action': _field(r, *ACTION_FIELDS),
+                    'date': _display_date(_field(r, *TRADE_DATE_FIELDS)),
+                    'traded_date': _display_date(_field(r, *TRADE_DATE_FIELDS)),
+                    'filed_date': _display_date(_field(r, *FILED_DATE_FIELDS)),
+                    'amount': _field(r, *AMOUNT_FIELDS) or 'N/A',
+                    'type': _field(r, *ASSET_TYPE_FIELDS) or 'Stock',
+                    'description': _field(r, 'description', 'comment') or ''
+                } for r in records if _field(r, *TICKER_FIELDS)]
+                print(f"Mapped {len(mapped['recent_trades'])} trades from {url}", flush=True)
+            elif ticker and _field(sample, *PRICE_FIELDS) is not None and _field(sample, *WEIGHT_FIELDS) is not None \
+                    and 'holdings' not in mapped:
+                holdings = []
+                for r in records:
+                    try:
+                        price = float(_field(r, *PRICE_FIELDS))
+                        weight = float(_field(r, *WEIGHT_FIELDS))
+                    except (TypeError, ValueError):
+                        continue
+                    holdings.append({
+                        'ticker': str(_field(r, *TICKER_FIELDS)).upper(),
+                        'last_price': price,
+                        'price_display': f'${price:,.2f}',
+                        'weight': weight,
+                        'weight_display': f'{weight:g}%'
+                    })
+                mapped['holdings'] = holdings
+                print(f"Mapped {len(holdings)} holdings from {url}", flush=True)
+            elif not ticker and has_date and _field(sample, *VALUE_FIELDS) is not None \
+                    and 'historical_performance' not in mapped:
+                mapped['historical_performance'] = [
+                    {'date': _field(r, 'date'), 'value': _field(r, *VALUE_FIELDS)}
+                    for r in records if _field(r, 'date') is not None
+                ]
+                print(f"Mapped {len(mapped['historical_performance'])} history points from {url}", flush=True)
+    return mapped
+
+
+def map_captured_stock(responses: List[Tuple[str, object]]) -> Dict:
+    """Map captured JSON feeds onto a stock page's Pelosi trades and price_history"""
+    mapped = {}
+    for url, data in responses:
+        for records in _record_lists(data):
+            sample = records[0]
+            politician = _field(sample, 'politician', 'member', 'representative', 'name')
+            if politician is not None and _field(sample, *ACTION_FIELDS) and 'trades' not in mapped:
+                mapped['trades'] = [{
+                    'politician': 'Nancy Pelosi',
+                    'traded_date': _display_date(_field(r, *TRADE_DATE_FIELDS)) or 'N/A',
+                    'filed_date': _display_date(_field(r, *FILED_DATE_FIELDS)) or 'N/A',
+                    'action': _field(r, *ACTION_FIELDS),
+                    'type': _field(r, *ASSET_TYPE_FIELDS) or 'Stock',
+                    'amount_range': _field(r, *AMOUNT_FIELDS) or 'N/A',
+                    'excess_return': _field(r, 'excessReturn', 'excess_return') or 'N/A',
+                    'non_compliant': bool(_field(r, 'nonCompliant', 'non_compliant', 'late'))
+                } for r in records if 'pelosi' in str(_field(r, 'politician', 'member', 'representative', 'name')).lower()]
+                print(f"Mapped {len(mapped['trades'])} Pelosi trades from {url}", flush=True)
+            elif _field(sample, 'date') is not None and _field(sample, 'price', 'close') is not None \
+                    and 'price_history' not in mapped:
+                mapped['price_history'] = [
+                    {'date': _field(r, 'date'), 'price': _field(r, 'price', 'close')}
+                    for r in records if _field(r, 'date') is not None
+                ]
+                print(f"Mapped {len(mapped['price_history'])} price points from {url}", flush=True)
+    return mapped
+
+
 class PelosiTrackerScraper:
-    def __init__(self):
+    def __init__(self, driver_pool: Optional[DriverPool] = None, table_extraction: str = 'script',
+                 scrape_mode: str = SCRAPE_MODE, http_fast_path: bool = True):
         self.base_url = "https://pelositracker.app"
+        self.driver_pool = driver_pool
+        self.scrape_mode = scrape_mode
+        # Try a plain GET first and only launch a browser when the server-rendered page lacks the data
+        self.http_fast_path = http_fast_path
+        self._session = None
+        # Batch scrapes reach _get_session() from several worker threads at once
+        self._session_lock = threading.Lock()
+        # 'script' serializes tables in one execute_script call, 'elements' walks them with find_elements
+        self.table_extraction = table_extraction
+        self.wait_timings = {}
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'User-Agent': DEFAULT_USER_AGENT,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
             'Accept-Encoding': 'gzip, deflate, br',
@@ -31,57 +589,174 @@ class PelosiTrackerScraper:
     
     def get_portfolio_data(self) -> Optional[Dict]:
         """Scrape ALL real portfolio data from pelositracker.app - NO MOCK DATA"""
+        url = f"{self.base_url}/portfolios/nancy-pelosi"
+        
+        if self.http_fast_path:
+            data = self._portfolio_from_html(url)
+            if data:
+                return data
+        
         if not SELENIUM_AVAILABLE:
             print("ERROR: Selenium not available - cannot scrape real data")
             return None
         
-        url = f"{self.base_url}/portfolios/nancy-pelosi"
-        
         try:
             return self._scrape_with_selenium(url)
         except Exception as e:
             print(f"ERROR scraping portfolio data: {e}")
             return None
     
+    def _get_session(self) -> requests.Session:
+        """Keep-alive HTTP session with a connection pool sized for batch scrapes"""
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers.update(self.headers)
+                # Only advertise encodings requests can decode (br needs the brotli package)
+                session.headers['Accept-Encoding'] = requests.utils.DEFAULT_ACCEPT_ENCODING
+                self._session = session
+            return self._session
+    
+    def _fetch_html(self, url: str) -> Optional[BeautifulSoup]:
+        """Server-rendered HTML for a page, without running any JavaScript"""
+        try:
+            response = self._get_session().get(url, timeout=10)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"HTTP fetch failed for {url}: {e}", flush=True)
+            return None
+        return BeautifulSoup(response.text, 'html.parser')
+    
+    def _embedded_json(self, soup: BeautifulSoup, url: str) -> List[Tuple[str, object]]:
+        """JSON embedded in the page: __NEXT_DATA__ and other application/json script blocks"""
+        documents = []
+        for script in soup.find_all('script', type=re.compile(r'application/(ld\+)?json')):
+            try:
+                documents.append((f"{url}#{script.get('id') or 'script'}", json.loads(script.string or '')))
+            except ValueError:
+                continue
+        return documents
+    
+    def _soup_tables(self, soup: BeautifulSoup) -> List[Dict]:
+        """Tables in server-rendered HTML, in the same shape as TABLE_SNAPSHOT_SCRIPT returns"""
+        heading = soup.find(string=re.compile('Congressional Trading Activity'))
+        activity = heading.find_next('table') if heading else None
+        tables = []
+        for table in soup.find_all('table'):
+            rows = []
+            for row in table.find_all('tr'):
+                cells = row.find_all('td') or row.find_all('th')
+                rows.append({
+                    'cells': [cell.get_text(strip=True) for cell in cells],
+                    'links': [a['href'] for a in row.find_all('a', href=True)],
+                    'text': row.get_text(' ', strip=True)
+                })
+            tables.append({
+                'headers': [th.get_text(strip=True) for th in table.find_all('th')],
+                'rows': rows,
+                'trading_activity': table is activity,
+                'mentions_pelosi': 'Pelosi' in table.get_text()
+            })
+        return tables
+    
+    def _portfolio_from_html(self, url: str) -> Optional[Dict]:
+        """Portfolio from a plain GET, or None when holdings or trades need the browser"""
+        soup = self._fetch_html(url)
+        if soup is None:
+            return None
+        
+        embedded = map_captured_portfolio(self._embedded_json(soup, url))
+        holdings = embedded.get('holdings') or self._holdings_from_snapshot(self._soup_tables(soup))
+        trades = embedded.get('recent_trades')
+        if not holdings or not trades:
+            print(f"Server-rendered page lacks holdings or trades, falling back to Selenium", flush=True)
+            return None
+        
+        print(f"Portfolio served from HTTP fast path ({len(holdings)} holdings, {len(trades)} trades)", flush=True)
+        return {
+            'holdings': holdings,
+            'performance': self._extract_performance_real(soup, None),
+            'stats': self._extract_stats_real(soup, None),
+            'recent_trades': trades,
+            'sector_allocation': self._extract_sectors_real(soup, None),
+            'historical_performance': embedded.get('historical_performance') or self._extract_historical_data_real(soup, None),
+            'filing_statistics': self._extract_filing_stats_real(soup, None),
+            'last_updated': datetime.now().isoformat()
+        }
+    
+    def _stock_from_html(self, url: str, ticker: str) -> Optional[Dict]:
+        """Stock page from a plain GET, or None when the price or trades need the browser"""
+        soup = self._fetch_html(url)
+        if soup is None:
+            return None
+        
+        embedded = map_captured_stock(self._embedded_json(soup, url))
+        trades = embedded.get('trades')
+        if trades is None:
+            trades = self._stock_trades_from_snapshot(self._soup_tables(soup), ticker)
+        price_match = re.search(r'Current Price[^$]*\$([\d,]+\.?\d*)', soup.get_text())
+        current_price = float(price_match.group(1).replace(',', '')) if price_match else 0.0
+        if trades is None or not current_price:
+            print(f"Server-rendered page for {ticker} lacks price or trades, falling back to Selenium", flush=True)
+            return None
+        
+        print(f"{ticker} served from HTTP fast path ({len(trades)} trades)", flush=True)
+        return {
+            'ticker': ticker.upper(),
+            'company_name': self._extract_company_name(soup, None, ticker),
+            'exchange': self._extract_exchange(soup, None),
+            'current_price': current_price,
+            'price_change': self._extract_price_change(soup, None),
+            'price_change_percent': self._extract_price_change_percent(soup, None),
+            'week_range_low': self._extract_week_range_low(soup, None),
+            'week_range_high': self._extract_week_range_high(soup, None),
+            'status': self._extract_status(soup, None),
+            'description': self._extract_description(soup, None, ticker),
+            'trades': trades,
+            'similar_stocks': self._extract_similar_stocks(soup, None),
+            'price_history': embedded.get('price_history') or self._extract_price_history(soup, None)
+        }
+    
+    def _get_pool(self) -> DriverPool:
+        """Driver pool for this scraper - the process-wide pool unless one was injected"""
+        if self.driver_pool is None:
+            self.driver_pool = get_driver_pool()
+        return self.driver_pool
+    
     def _scrape_with_selenium(self, url: str) -> Optional[Dict]:
         """Scrape using Selenium - extract ALL real data"""
-        options = Options()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        options.add_argument(f'user-agent={self.headers["User-Agent"]}')
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        
+        pool = self._get_pool()
         driver = None
+        broken = False
         try:
-            driver = webdriver.Chrome(options=options)
+            driver = pool.acquire()
+            capture = NetworkCapture(driver) if self.scrape_mode == 'network' else None
             driver.get(url)
+            readiness = PageReadiness(driver, 'portfolio')
             
-            # Wait for page to fully load
-            time.sleep(8)
-            
-            # Wait for content to be visible
-            try:
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "body"))
-                )
-            except:
-                pass
+            # Wait until the holdings table has rendered rows, then for late XHRs to settle
+            readiness.wait_for('holdings_table', table_has_rows(HOLDINGS_HEADER_KEYWORDS))
+            readiness.wait_for('network_idle', network_idle(), timeout=5)
             
             # Get page source after JS execution
             page_source = driver.page_source
             soup = BeautifulSoup(page_source, 'html.parser')
             
+            # Use the page's own JSON feeds where captured, walking the DOM only for what is missing
+            captured = map_captured_portfolio(capture.json_responses()) if capture else {}
+            
             # Extract ALL data
-            holdings = self._extract_holdings_real(soup, driver)
+            holdings = captured.get('holdings') or self._extract_holdings_real(soup, driver)
             performance = self._extract_performance_real(soup, driver)
             stats = self._extract_stats_real(soup, driver)
-            trades = self._extract_trades_real(soup, driver)
+            trades = captured.get('recent_trades') or self._extract_trades_real(soup, driver, readiness)
             sectors = self._extract_sectors_real(soup, driver)
-            historical_data = self._extract_historical_data_real(soup, driver)
+            historical_data = captured.get('historical_performance') or self._extract_historical_data_real(soup, driver)
             filing_stats = self._extract_filing_stats_real(soup, driver)
+            self.wait_timings[url] = readiness.summary()
             
             return {
                 'holdings': holdings,
@@ -97,23 +772,34 @@ class PelosiTrackerScraper:
             print(f"Selenium error: {e}")
             import traceback
             traceback.print_exc()
+            broken = driver is not None and not pool.is_healthy(driver)
             return None
         finally:
             if driver:
-                driver.quit()
+                pool.release(driver, broken=broken)
     
     def _extract_holdings_real(self, soup: BeautifulSoup, driver) -> List[Dict]:
         """Extract real holdings from the page"""
         holdings = []
         
+        # Method 0: Serialize all tables in one round-trip and parse them in Python
+        walk_elements = self.table_extraction != 'script'
+        if not walk_elements:
+            try:
+                holdings = self._holdings_from_snapshot(self._snapshot_tables(driver))
+                if holdings:
+                    print(f"Extracted {len(holdings)} holdings from table snapshot", flush=True)
+                    return holdings
+            except Exception as e:
+                print(f"Table snapshot failed: {e}, walking elements instead", flush=True)
+                walk_elements = True
+        
         try:
-            # Wait for table to load
-            time.sleep(3)
-            
             # Method 1: Use Selenium to find holdings table
             try:
-                tables = driver.find_elements(By.TAG_NAME, "table")
-                print(f"Found {len(tables)} tables for holdings extraction", flush=True)
+                tables = driver.find_elements(By.TAG_NAME, "table") if walk_elements else []
+                if walk_elements:
+                    print(f"Found {len(tables)} tables for holdings extraction", flush=True)
                 
                 for table in tables:
                     headers = table.find_elements(By.TAG_NAME, "th")
@@ -138,19 +824,10 @@ class PelosiTrackerScraper:
                                             text = text.strip()
                                         cell_texts.append(text)
                                     
-                                    ticker = cell_texts[0] if len(cell_texts) > 0 else ''
-                                    price_text = cell_texts[1] if len(cell_texts) > 1 else ''
-                                    weight_text = cell_texts[2] if len(cell_texts) > 2 else ''
-                                    
-                                    if ticker and re.match(r'^[A-Z]{1,5}$', ticker):
-                                        holdings.append({
-                                            'ticker': ticker,
-                                            'last_price': self._parse_price(price_text),
-                                            'price_display': price_text or f'${self._parse_price(price_text):.2f}',
-                                            'weight': self._parse_percentage(weight_text),
-                                            'weight_display': weight_text or f'{self._parse_percentage(weight_text):.1f}%'
-                                        })
-                                        print(f"Added holding: {ticker} - {price_text} - {weight_text}", flush=True)
+                                    holding = self._holding_from_cells(cell_texts)
+                                    if holding:
+                                        holdings.append(holding)
+                                        print(f"Added holding: {holding['ticker']} - {holding['price_display']} - {holding['weight_display']}", flush=True)
                             except Exception as e:
                                 print(f"Error processing holdings row: {e}", flush=True)
                                 continue
@@ -312,7 +989,7 @@ class PelosiTrackerScraper:
         
         return stats
     
-    def _extract_trades_real(self, soup: BeautifulSoup, driver) -> List[Dict]:
+    def _extract_trades_real(self, soup: BeautifulSoup, driver, readiness: Optional[PageReadiness] = None) -> List[Dict]:
         """Extract REAL Nancy Pelosi trades from pelositracker.app"""
         trades = []
         
@@ -320,7 +997,8 @@ class PelosiTrackerScraper:
             print("Scrolling to find trades section...", flush=True)
             # Scroll down to load more content
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(3)
+            if readiness:
+                readiness.wait_for('trades_lazy_load', network_idle(), timeout=5)
             
             # Look for ALL links on the page - trades are usually linked
             print("Looking for trade links...", flush=True)
@@ -485,6 +1163,86 @@ class PelosiTrackerScraper:
         
         return filing_stats
     
+    def _snapshot_tables(self, driver) -> List[Dict]:
+        """Every table on the page as plain data, fetched with a single execute_script"""
+        tables = driver.execute_script(TABLE_SNAPSHOT_SCRIPT) or []
+        print(f"Snapshot captured {len(tables)} tables", flush=True)
+        return tables
+    
+    def _holding_from_cells(self, cell_texts: List[str]) -> Optional[Dict]:
+        """Parse one holdings table row (ticker, price, weight)"""
+        ticker = cell_texts[0] if len(cell_texts) > 0 else ''
+        price_text = cell_texts[1] if len(cell_texts) > 1 else ''
+        weight_text = cell_texts[2] if len(cell_texts) > 2 else ''
+        
+        if not (ticker and re.match(r'^[A-Z]{1,5}$', ticker)):
+            return None
+        return {
+            'ticker': ticker,
+            'last_price': self._parse_price(price_text),
+            'price_display': price_text or f'${self._parse_price(price_text):.2f}',
+            'weight': self._parse_percentage(weight_text),
+            'weight_display': weight_text or f'{self._parse_percentage(weight_text):.1f}%'
+        }
+    
+    def _holdings_from_snapshot(self, tables: List[Dict]) -> List[Dict]:
+        """Holdings from the first snapshot table whose headers look like a holdings table"""
+        for table in tables:
+            header_str = ' '.join(h.lower() for h in table['headers'])
+            if not any(keyword in header_str for keyword in HOLDINGS_HEADER_KEYWORDS):
+                continue
+            holdings = []
+            for row in table['rows'][1:]:  # Skip header
+                if len(row['cells']) >= 3:
+                    holding = self._holding_from_cells(row['cells'])
+                    if holding:
+                        holdings.append(holding)
+            if holdings:
+                return holdings
+        return []
+    
+    def _stock_trade_from_cells(self, cell_texts: List[str], row_text: str) -> Optional[Dict]:
+        """Parse one Congressional Trading Activity row, keeping only Nancy Pelosi's trades"""
+        politician = cell_texts[0] if len(cell_texts) > 0 else 'N/A'
+        
+        # Check if this is Nancy Pelosi - be flexible with matching
+        politician_lower = politician.lower()
+        is_pelosi = 'nancy pelosi' in politician_lower or (politician_lower == 'pelosi' and len(politician) < 20)
+        if not is_pelosi:
+            return None
+        return {
+            'politician': 'Nancy Pelosi',  # Normalize to consistent name
+            'traded_date': cell_texts[1] if len(cell_texts) > 1 else 'N/A',
+            'filed_date': cell_texts[2] if len(cell_texts) > 2 else 'N/A',
+            'action': cell_texts[3] if len(cell_texts) > 3 else 'N/A',
+            'type': cell_texts[4] if len(cell_texts) > 4 else 'Stock',
+            'amount_range': cell_texts[5] if len(cell_texts) > 5 else 'N/A',
+            'excess_return': cell_texts[6] if len(cell_texts) > 6 else 'N/A',
+            'non_compliant': 'Non-Compliant' in row_text or 'non-compliant' in row_text.lower()
+        }
+    
+    def _stock_trades_from_snapshot(self, tables: List[Dict], ticker: str) -> Optional[List[Dict]]:
+        """Pelosi trades from the trading activity table in a snapshot, or None if there is no such table"""
+        def is_trades_table(table):
+            header_str = ' '.join(h.lower() for h in table['headers'])
+            return 'politician' in header_str or ('traded' in header_str and 'date' in header_str)
+        
+        # Same preference order as the element walk: heading, then headers, then any Pelosi table
+        table = (next((t for t in tables if t['trading_activity']), None)
+                 or next((t for t in tables if is_trades_table(t)), None)
+                 or next((t for t in tables if t['mentions_pelosi']), None))
+        if table is None:
+            return None
+        
+        trades = []
+        for row in table['rows'][1:]:  # Skip header
+            if len(row['cells']) >= 6:
+                trade = self._stock_trade_from_cells(row['cells'], row['text'])
+                if trade:
+                    trades.append(trade)
+        print(f"Extracted {len(trades)} Nancy Pelosi trades for {ticker} from table snapshot", flush=True)
+        return trades
+    
     def _parse_price(self, price_str: str) -> float:
         """Parse price string to float"""
         try:
@@ -501,12 +1259,17 @@ class PelosiTrackerScraper:
     
     def get_stock_data(self, ticker: str) -> Optional[Dict]:
         """Scrape real stock data from pelositracker.app/stock/<ticker>"""
+        url = f"{self.base_url}/stock/{ticker.lower()}"
+        
+        if self.http_fast_path:
+            data = self._stock_from_html(url, ticker)
+            if data:
+                return data
+        
         if not SELENIUM_AVAILABLE:
             print(f"ERROR: Selenium not available - cannot scrape stock data for {ticker}")
             return None
         
-        url = f"{self.base_url}/stock/{ticker.lower()}"
-        
         try:
             return self._scrape_stock_page(url, ticker)
         except Exception as e:
@@ -515,49 +1278,53 @@ class PelosiTrackerScraper:
             traceback.print_exc()
             return None
     
+    def get_stock_data_many(self, tickers: Iterable[str], max_workers: int = 4) -> Iterator[Tuple[str, Optional[Dict]]]:
+        """Scrape several stock pages concurrently, yielding (ticker, data) as each one finishes.
+
+        Tickers run on pooled browsers, at most as many at once as the pool
+        allows (SCRAPE_POOL_SIZE, default 4), so a batch never starts extra
+        Chrome instances. A batch no larger than the pool takes about as long
+        as its slowest page; n tickers take about n / pool size page loads. A
+        failed ticker yields None without affecting the others.
+        """
+        unique = list(dict.fromkeys(t.upper() for t in tickers if t))
+        if not unique:
+            return
+        
+        workers = max(1, min(max_workers, len(unique), self._get_pool().max_size))
+        print(f"Scraping {len(unique)} tickers with {workers} workers", flush=True)
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='stock-scrape') as executor:
+            futures = {executor.submit(self.get_stock_data, ticker): ticker for ticker in unique}
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    yield ticker, future.result()
+                except Exception as e:
+                    print(f"ERROR scraping stock data for {ticker}: {e}", flush=True)
+                    yield ticker, None
+    
     def _scrape_stock_page(self, url: str, ticker: str) -> Optional[Dict]:
         """Scrape stock detail page"""
         print(f"SCRAPING STOCK PAGE: {url} for ticker {ticker}", flush=True)
         
-        options = Options()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        options.add_argument('--disable-logging')
-        options.add_argument('--log-level=3')
-        options.add_argument(f'user-agent={self.headers["User-Agent"]}')
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_experimental_option('excludeSwitches', ['enable-logging'])
-        
+        pool = self._get_pool()
         driver = None
+        broken = False
         try:
-            driver = webdriver.Chrome(options=options)
-            driver.set_page_load_timeout(30)  # 30 second timeout
+            driver = pool.acquire()
+            capture = NetworkCapture(driver) if self.scrape_mode == 'network' else None
             print(f"Navigating to {url}", flush=True)
             driver.get(url)
+            readiness = PageReadiness(driver, 'stock')
             
-            # Wait for page to fully load
+            # Wait for the header, the price and the trading activity table to render
             print(f"Waiting for page to load...", flush=True)
-            time.sleep(10)
-            
-            # Wait for specific elements to appear
-            try:
-                WebDriverWait(driver, 25).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "h1"))
-                )
-                print(f"Page loaded, h1 found", flush=True)
-                # Wait for table if it exists
-                try:
-                    WebDriverWait(driver, 15).until(
-                        EC.presence_of_element_located((By.TAG_NAME, "table"))
-                    )
-                    print(f"Table found on page", flush=True)
-                except:
-                    print(f"No table found yet, continuing anyway", flush=True)
-            except Exception as e:
-                print(f"Wait timeout: {e}, continuing anyway", flush=True)
+            if readiness.wait_for('h1', element_present('h1')):
+                readiness.wait_for('price', text_matches(r'\$\d'), timeout=5)
+                if not readiness.wait_for('trading_activity', trading_activity_populated()):
+                    print(f"No trading activity table yet, continuing anyway", flush=True)
+            readiness.wait_for('network_idle', network_idle(), timeout=3)
             
             # Verify we're on the right page
             current_url = driver.current_url
@@ -579,6 +1346,8 @@ class PelosiTrackerScraper:
             soup = BeautifulSoup(page_source, 'html.parser')
             print(f"BeautifulSoup parsed successfully", flush=True)
             
+            captured = map_captured_stock(capture.json_responses()) if capture else {}
+            
             # Extract stock data - wrap each extraction in try/except to prevent crashes
             try:
                 company_name = self._extract_company_name(soup, driver, ticker)
@@ -628,7 +1397,7 @@ class PelosiTrackerScraper:
                 description = f'Information about {ticker}'
             
             try:
-                trades = self._extract_stock_trades(soup, driver, ticker)
+                trades = captured['trades'] if 'trades' in captured else self._extract_stock_trades(soup, driver, ticker, readiness)
             except Exception as e:
                 print(f"Error extracting trades: {e}", flush=True)
                 trades = []
@@ -639,7 +1408,7 @@ class PelosiTrackerScraper:
                 similar_stocks = []
             
             try:
-                price_history = self._extract_price_history(soup, driver)
+                price_history = captured.get('price_history') or self._extract_price_history(soup, driver)
             except:
                 price_history = []
             
@@ -658,6 +1427,7 @@ class PelosiTrackerScraper:
                 'similar_stocks': similar_stocks,
                 'price_history': price_history
             }
+            self.wait_timings[url] = readiness.summary()
             
             print(f"Extracted data for {ticker}: Price=${stock_data['current_price']}, Trades={len(stock_data['trades'])}", flush=True)
             return stock_data
@@ -665,13 +1435,11 @@ class PelosiTrackerScraper:
             print(f"Error scraping stock page for {ticker}: {e}", flush=True)
             import traceback
             traceback.print_exc()
+            broken = driver is not None and not pool.is_healthy(driver)
             return None
         finally:
             if driver:
-                try:
-                    driver.quit()
-                except:
-                    pass
+                pool.release(driver, broken=broken)
     
     def _extract_company_name(self, soup: BeautifulSoup, driver, ticker: str) -> str:
         """Extract company name - find the h1 element"""
@@ -717,9 +1485,6 @@ class PelosiTrackerScraper:
     def _extract_current_price(self, soup: BeautifulSoup, driver, ticker: str) -> float:
         """Extract current price - find the actual price element"""
         try:
-            # Wait for price to load
-            time.sleep(2)
-            
             # Method 1: Look for "Current Price" text and get the value after it
             try:
                 price_elements = driver.find_elements(By.XPATH, "//*[contains(text(), 'Current Price')]")
@@ -842,27 +1607,36 @@ class PelosiTrackerScraper:
             pass
         return f'Information about {ticker} from pelositracker.app'
     
-    def _extract_stock_trades(self, soup: BeautifulSoup, driver, ticker: str) -> List[Dict]:
+    def _extract_stock_trades(self, soup: BeautifulSoup, driver, ticker: str, readiness: Optional[PageReadiness] = None) -> List[Dict]:
         """Extract ONLY Nancy Pelosi's trades for this specific stock - 100% accurate"""
         trades = []
         
         try:
-            # Wait longer for table to fully load
-            time.sleep(8)
-            
             # Scroll to make sure table is visible
             try:
                 driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-                time.sleep(2)
+                if readiness:
+                    readiness.wait_for('trades_scroll', network_idle(), timeout=3)
             except:
                 pass
             
+            # Method 0: Serialize all tables in one round-trip and parse them in Python
+            if self.table_extraction == 'script':
+                snapshot_trades = None
+                try:
+                    snapshot_trades = self._stock_trades_from_snapshot(self._snapshot_tables(driver), ticker)
+                except Exception as e:
+                    print(f"Table snapshot failed for {ticker}: {e}, walking elements instead", flush=True)
+                if snapshot_trades is not None:
+                    return snapshot_trades
+            
             # Try multiple methods to find the table
             table = None
             
             # Method 1: Find by heading text - most reliable
             try:
-                heading = WebDriverWait(driver, 20).until(
+                heading_timeout = max(readiness.remaining(), 1) if readiness else 20
+                heading = WebDriverWait(driver, heading_timeout).until(
                     EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'Congressional Trading Activity')]"))
                 )
                 # Find table after the heading - try multiple XPath patterns
@@ -938,21 +1712,8 @@ class PelosiTrackerScraper:
                             politician = cell_texts[0] if len(cell_texts) > 0 else 'N/A'
                             print(f"Row {i} politician: '{politician}'", flush=True)
                             
-                            # Check if this is Nancy Pelosi - be flexible with matching
-                            politician_lower = politician.lower()
-                            is_pelosi = 'nancy pelosi' in politician_lower or (politician_lower == 'pelosi' and len(politician) < 20)
-                            
-                            if is_pelosi:
-                                trade = {
-                                    'politician': 'Nancy Pelosi',  # Normalize to consistent name
-                                    'traded_date': cell_texts[1] if len(cell_texts) > 1 else 'N/A',
-                                    'filed_date': cell_texts[2] if len(cell_texts) > 2 else 'N/A',
-                                    'action': cell_texts[3] if len(cell_texts) > 3 else 'N/A',
-                                    'type': cell_texts[4] if len(cell_texts) > 4 else 'Stock',
-                                    'amount_range': cell_texts[5] if len(cell_texts) > 5 else 'N/A',
-                                    'excess_return': cell_texts[6] if len(cell_texts) > 6 else 'N/A',
-                                    'non_compliant': 'Non-Compliant' in row.text or 'non-compliant' in row.text.lower()
-                                }
+                            trade = self._stock_trade_from_cells(cell_texts, row.text)
+                            if trade:
                                 trades.append(trade)
                                 print(f"Added trade #{len(trades)}: {trade['action']} {trade['type']} on {trade['traded_date']}", flush=True)
                             elif politician and politician != 'N/A':
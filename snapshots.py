@@ -0,0 +1,160 @@
+"""
+Immutable, versioned portfolio snapshots
+A snapshot is built off to the side and published by swapping a single reference,
+so request threads read one consistent portfolio without taking a lock.
+"""
+import functools
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Callable, Dict, Mapping, Optional, Tuple, TypeVar
+
+from trade_store import TradeStore
+
+T = TypeVar('T')
+
+
+def freeze(value):
+    """Read-only deep copy: mappings become MappingProxyType and lists tuples, so the result
+    shares nothing mutable with its source and cannot be written through"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def reference_table(value):
+    """Load-once, read-only copy of a literal table"""
+    return freeze(value)
+
+
+def project(document: Mapping, fields) -> Dict:
+    """Copy of document with only the named fields. 'a.b' selects key b inside a, applied to
+    each element when a is a list; fields the document does not have are left out."""
+    result: Dict = {}
+    for field in fields:
+        _project_into(result, document, field.split('.'))
+    return result
+
+
+def _project_into(target: Dict, source, path):
+    key, rest = path[0], path[1:]
+    if not isinstance(source, Mapping) or key not in source:
+        return
+    value = source[key]
+    if not rest:
+        target[key] = value
+    elif target.get(key) is value:
+        # The whole value was already selected; never write into the source document
+        return
+    elif isinstance(value, Mapping):
+        _project_into(target.setdefault(key, {}), value, rest)
+    elif isinstance(value, (list, tuple)):
+        items = target.setdefault(key, [{} for _ in value])
+        for item_target, item in zip(items, value):
+            _project_into(item_target, item, rest)
+
+
+def per_version(build: Callable[['PortfolioSnapshot'], T]) -> Callable[['PortfolioSnapshot'], T]:
+    """Memoize build(snapshot) for the most recent snapshot version.
+    The (version, value) pair is swapped as one tuple, so concurrent readers never mix versions."""
+    latest = [(None, None)]
+
+    @functools.wraps(build)
+    def wrapper(snapshot: 'PortfolioSnapshot') -> T:
+        version, value = latest[0]
+        if version != snapshot.version:
+            value = build(snapshot)
+            latest[0] = (snapshot.version, value)
+        return value
+
+    return wrapper
+
+
+@dataclass(frozen=True)
+class PortfolioSnapshot:
+    """One published version of the portfolio; never mutated after build()"""
+    version: int
+    portfolio: Mapping
+    holdings: Tuple[Mapping, ...]
+    trades: Tuple[Mapping, ...]
+    historical_performance: Tuple[Mapping, ...]
+    holdings_by_ticker: Mapping[str, Mapping]
+    trade_store: TradeStore
+    fetched_at: float
+
+    @classmethod
+    def build(cls, portfolio: Dict, version: int, fetched_at: Optional[float] = None,
+              trade_store: Optional[TradeStore] = None) -> 'PortfolioSnapshot':
+        frozen = freeze(portfolio)
+        # Trades accumulate across versions; new ones are indexed into the store handed in
+        trade_store = trade_store if trade_store is not None else TradeStore()
+        trade_store.add_many(frozen.get('recent_trades', ()))
+        holdings = frozen.get('holdings', ())
+        holdings_by_ticker = {}
+        for holding in holdings:
+            if holding.get('ticker'):
+                # First row wins, as the old linear scan did
+                holdings_by_ticker.setdefault(holding['ticker'].upper(), holding)
+        return cls(
+            version=version,
+            portfolio=frozen,
+            holdings=holdings,
+            trades=frozen.get('recent_trades', ()),
+            historical_performance=frozen.get('historical_performance', ()),
+            holdings_by_ticker=MappingProxyType(holdings_by_ticker),
+            trade_store=trade_store,
+            fetched_at=fetched_at if fetched_at is not None else time.time(),
+        )
+
+    def next(self, portfolio: Dict) -> 'PortfolioSnapshot':
+        """Build the snapshot that supersedes this one, extending a copy of this trade store"""
+        return PortfolioSnapshot.build(portfolio, self.version + 1, trade_store=self.trade_store.copy())
+
+
+def portfolio_delta(old: PortfolioSnapshot, new: PortfolioSnapshot) -> Dict:
+    """What a client holding old.portfolio needs to rebuild new.portfolio.
+
+    holdings: rows that changed (keyed by ticker), tickers removed and the new order.
+    appended/prepended: items added to the end/start of lists that otherwise kept their contents
+    (new trades, new history points). changed: every other top-level section that differs, in full.
+    removed: top-level sections that disappeared.
+    """
+    delta = {'version': new.version, 'since': old.version, 'full': False,
+             'changed': {}, 'removed': [], 'appended': {}, 'prepended': {}}
+    before, after = old.portfolio, new.portfolio
+    delta['removed'] = [key for key in before if key not in after]
+    for key, value in after.items():
+        previous = before.get(key)
+        if key in before and previous == value:
+            continue
+        if key == 'holdings' and key in before:
+            holdings = _holdings_delta(previous, value)
+            if holdings is not None:
+                delta['holdings'] = holdings
+                continue
+        if isinstance(value, tuple) and isinstance(previous, tuple) and len(value) > len(previous):
+            added = len(value) - len(previous)
+            if value[:len(previous)] == previous:
+                delta['appended'][key] = value[len(previous):]
+                continue
+            if value[added:] == previous:
+                delta['prepended'][key] = value[:added]
+                continue
+        delta['changed'][key] = value
+    return delta
+
+
+def _holdings_delta(before, after) -> Optional[Dict]:
+    """Per-ticker holdings diff, or None when tickers are missing or repeated"""
+    old_rows = {row.get('ticker'): row for row in before}
+    new_rows = {row.get('ticker'): row for row in after}
+    if None in old_rows or None in new_rows or len(old_rows) != len(before) or len(new_rows) != len(after):
+        return None
+    return {
+        'updated': [row for ticker, row in new_rows.items() if old_rows.get(ticker) != row],
+        'removed': [ticker for ticker in old_rows if ticker not in new_rows],
+        'order': list(new_rows),
+    }
+
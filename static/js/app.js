@@ -1,18 +1,57 @@
 const API_BASE = '/api';
+const POLL_INTERVAL_MS = 5 * 60 * 1000;
+// 'off' where the server cannot hold streams open (serverless deployments); polling is then the main path
+const UPDATE_STREAM = document.currentScript?.dataset.updateStream !== 'off';
+
+// Snapshot version, its server epoch (X-Data-Epoch) and the document on screen; later
+// fetches ask only for what changed since. Versions restart per server process, so a delta
+// is only valid against the same epoch.
+let loadedVersion = null;
+let loadedEpoch = null;
+let loadedPortfolio = null;
 
 async function fetchPortfolioData() {
     try {
-        const response = await fetch(`${API_BASE}/portfolio`);
+        const url = loadedPortfolio
+            ? `${API_BASE}/portfolio?since=${loadedVersion}&epoch=${encodeURIComponent(loadedEpoch || '')}`
+            : `${API_BASE}/portfolio`;
+        const response = await fetch(url);
         if (!response.ok) {
             throw new Error('Failed to fetch portfolio data');
         }
-        const data = await response.json();
+        const body = await response.json();
+        if (loadedPortfolio && !body.full && (body.since !== loadedVersion || body.epoch !== loadedEpoch)) {
+            // Not a delta against what is on screen; start over from the full document
+            loadedPortfolio = null;
+            return fetchPortfolioData();
+        }
+        const data = loadedPortfolio ? applyPortfolioDelta(loadedPortfolio, body) : body;
+        loadedVersion = Number(response.headers.get('X-Data-Version')) || loadedVersion;
+        loadedEpoch = response.headers.get('X-Data-Epoch') || loadedEpoch;
+        loadedPortfolio = data;
         updateUI(data);
     } catch (error) {
         console.error('Error fetching portfolio data:', error);
     }
 }
 
+// Rebuild the full portfolio from a ?since= response (see snapshots.portfolio_delta)
+function applyPortfolioDelta(base, delta) {
+    if (delta.full) {
+        return delta.portfolio;
+    }
+    const data = { ...base, ...delta.changed };
+    delta.removed.forEach((key) => delete data[key]);
+    Object.entries(delta.appended).forEach(([key, items]) => { data[key] = [...(base[key] || []), ...items]; });
+    Object.entries(delta.prepended).forEach(([key, items]) => { data[key] = [...items, ...(base[key] || [])]; });
+    if (delta.holdings) {
+        const rows = new Map((base.holdings || []).map((holding) => [holding.ticker, holding]));
+        delta.holdings.updated.forEach((holding) => rows.set(holding.ticker, holding));
+        data.holdings = delta.holdings.order.map((ticker) => rows.get(ticker));
+    }
+    return data;
+}
+
 function updateUI(data) {
     console.log('Updating UI with data:', data);
     
@@ -201,13 +240,43 @@ if (document.readyState === 'loading') {
     fetchPortfolioData();
 }
 
-// Auto-refresh every 5 minutes
-setInterval(() => {
+function refreshPortfolio() {
     fetchPortfolioData();
     if (typeof setUpdateTime === 'function') {
         setUpdateTime();
     }
-}, 5 * 60 * 1000);
+}
+
+// Poll every 5 minutes; used when the update stream is off or unavailable
+let pollTimer = null;
+function startPolling() {
+    if (!pollTimer) {
+        pollTimer = setInterval(refreshPortfolio, POLL_INTERVAL_MS);
+    }
+}
+
+// Refetch only when the server publishes a new snapshot version
+function subscribeToUpdates() {
+    if (!UPDATE_STREAM || typeof EventSource === 'undefined') {
+        startPolling();
+        return;
+    }
+    const stream = new EventSource(`${API_BASE}/stream`);
+    stream.addEventListener('snapshot', (event) => {
+        const { version, epoch } = JSON.parse(event.data);
+        if (loadedVersion !== null && (version !== loadedVersion || epoch !== loadedEpoch)) {
+            refreshPortfolio();
+        }
+    });
+    stream.onerror = () => {
+        // EventSource retries on its own; fall back to polling once it gives up
+        if (stream.readyState === EventSource.CLOSED) {
+            startPolling();
+        }
+    };
+}
+
+subscribeToUpdates();
 
 // Helper function for skeleton loaders (if not in enhancements.js)
 if (typeof createSkeletonLoader === 'undefined') {
@@ -1,15 +1,52 @@
 const API_BASE = '/api';
+// Most points a chart series needs; longer histories are downsampled server-side (LTTB)
+const CHART_POINTS = 120;
+
+const PROFILE_ID = 'nancy';
 
 let performanceChart = null;
 let holdingsChart = null;
 
+// Data the server rendered into the page, used for the first paint instead of an API round trip
+function readInitialData() {
+    const el = document.getElementById('initial-data');
+    if (!el) return null;
+    try {
+        return JSON.parse(el.textContent);
+    } catch (error) {
+        return null;
+    }
+}
+
+// One /api/profile-bundle response shared by every section of the page
+let profileBundlePromise = null;
+let initialBundle = readInitialData();
+
+function loadProfileBundle() {
+    if (!profileBundlePromise && initialBundle) {
+        profileBundlePromise = Promise.resolve(initialBundle);
+        initialBundle = null;
+    }
+    if (!profileBundlePromise) {
+        profileBundlePromise = fetch(`${API_BASE}/profile-bundle/${PROFILE_ID}?points=${CHART_POINTS}`)
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error('Failed to fetch profile data');
+                }
+                return response.json();
+            })
+            .catch(error => {
+                // Let the next caller retry instead of reusing the failure
+                profileBundlePromise = null;
+                throw error;
+            });
+    }
+    return profileBundlePromise;
+}
+
 async function fetchPortfolioData() {
     try {
-        const response = await fetch(`${API_BASE}/portfolio`);
-        if (!response.ok) {
-            throw new Error('Failed to fetch portfolio data');
-        }
-        const data = await response.json();
+        const data = (await loadProfileBundle()).portfolio;
         updateProfileUI(data);
     } catch (error) {
         console.error('Error fetching portfolio data:', error);
@@ -183,9 +220,9 @@ function updateRecentTrades(trades) {
 
 function updateSectorAllocation() {
     // Get REAL sector data from API
-    fetch(`${API_BASE}/portfolio`)
-        .then(response => response.json())
-        .then(data => {
+    loadProfileBundle()
+        .then(bundle => {
+            const data = bundle.portfolio;
             const sectors = data.sector_allocation || [];
             const listEl = document.getElementById('sector-list');
             if (!listEl) return;
@@ -221,9 +258,9 @@ function initPerformanceChart() {
     if (!ctx) return;
 
     // Get REAL historical data from API
-    fetch(`${API_BASE}/portfolio`)
-        .then(response => response.json())
-        .then(data => {
+    loadProfileBundle()
+        .then(bundle => {
+            const data = bundle.portfolio;
             fullHistoricalData = data.historical_performance || [];
             
             if (fullHistoricalData.length === 0) {
@@ -369,8 +406,11 @@ function createChart(labels, data) {
 // Load Nancy Says quote
 async function loadNewQuote() {
     try {
-        const response = await fetch(`${API_BASE}/nancy-quote`);
-        const quote = await response.json();
+        // Quotes come with the bundle; pick one locally and only ask the server without them
+        const quotes = (await loadProfileBundle().catch(() => ({}))).quotes || [];
+        const quote = quotes.length
+            ? quotes[Math.floor(Math.random() * quotes.length)]
+            : await (await fetch(`${API_BASE}/nancy-quote`)).json();
         
         document.getElementById('nancy-quote-text').textContent = `"${quote.quote}"`;
         document.getElementById('nancy-quote-source').textContent = `— ${quote.source}`;
@@ -391,8 +431,8 @@ let sp500Chart = null;
 
 async function loadSP500Comparison() {
     try {
-        const response = await fetch(`${API_BASE}/sp500-comparison`);
-        const data = await response.json();
+        const data = (await loadProfileBundle()).sp500_comparison;
+        if (!data) return;
         
         // Update stats
         document.getElementById('pelosi-return').textContent = `+${data.pelosi_return}%`;
@@ -536,8 +576,8 @@ function shareTradeOnTwitter(ticker, action, date, amount) {
 // Load trade predictions
 async function loadTradePredictions() {
     try {
-        const response = await fetch(`${API_BASE}/trade-predictions`);
-        const data = await response.json();
+        const data = (await loadProfileBundle()).trade_predictions;
+        if (!data) return;
         
         const grid = document.getElementById('predictions-grid');
         if (!grid) return;
@@ -1,4 +1,6 @@
 const API_BASE = '/api';
+// Most points a chart series needs; longer histories are downsampled server-side (LTTB)
+const CHART_POINTS = 120;
 
 // Get ticker from URL path, not window variable
 function getTickerFromURL() {
@@ -11,6 +13,19 @@ const TICKER = getTickerFromURL();
 
 let priceChart = null;
 
+// Data the server rendered into the page, used for the first paint instead of an API round trip
+function readInitialData() {
+    const el = document.getElementById('initial-data');
+    if (!el) return null;
+    try {
+        return JSON.parse(el.textContent);
+    } catch (error) {
+        return null;
+    }
+}
+
+let initialData = readInitialData();
+
 async function fetchStockData() {
     const ticker = getTickerFromURL();
     if (!ticker) {
@@ -21,11 +36,16 @@ async function fetchStockData() {
     console.log(`Fetching stock data for ${ticker}`);
     
     try {
-        const response = await fetch(`${API_BASE}/stock/${ticker}`);
-        if (!response.ok) {
-            throw new Error(`Failed to fetch stock data for ${ticker}`);
+        let data = initialData;
+        initialData = null;
+        if (!data) {
+            // Later refreshes go to the API
+            const response = await fetch(`${API_BASE}/stock/${ticker}?points=${CHART_POINTS}`);
+            if (!response.ok) {
+                throw new Error(`Failed to fetch stock data for ${ticker}`);
+            }
+            data = await response.json();
         }
-        const data = await response.json();
         
         // VERIFY the data is for the correct ticker
         if (data.ticker && data.ticker.toUpperCase() !== ticker.toUpperCase()) {
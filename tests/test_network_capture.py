@@ -0,0 +1,81 @@
+"""
+NetworkCapture against a performance log recorded from Chrome 141 loading the
+stand-in portfolio page (tests/fixtures/performance_log.json)
+
+Run: python -m unittest discover tests
+"""
+import base64
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper import NetworkCapture, map_captured_portfolio
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'performance_log.json')
+
+
+class RecordedDriver:
+    """Replays a recorded performance log and the Network.getResponseBody results that went with it"""
+
+    def __init__(self, entries, bodies, logging_enabled: bool = True):
+        self.logs = [[], entries]
+        self.bodies = bodies
+        self.logging_enabled = logging_enabled
+        self.body_requests = []
+
+    def get_log(self, kind):
+        if not self.logging_enabled:
+            raise Exception("log type 'performance' not found")
+        return self.logs.pop(0) if self.logs else []
+
+    def execute_cdp_cmd(self, command, params):
+        self.body_requests.append((command, params['requestId']))
+        return self.bodies[params['requestId']]
+
+
+class NetworkCaptureTest(unittest.TestCase):
+
+    def setUp(self):
+        with open(FIXTURE) as f:
+            self.recording = json.load(f)
+        self.driver = RecordedDriver(self.recording['entries'], self.recording['bodies'])
+
+    def test_reads_only_json_responses(self):
+        responses = NetworkCapture(self.driver).json_responses()
+        paths = [url.split('/', 3)[3] for url, _ in responses]
+        self.assertEqual(paths, ['api/portfolios/nancy-pelosi', 'api/portfolios/nancy-pelosi/history'])
+        # Bodies are fetched for the JSON responses only, not the page, images, fonts or scripts
+        self.assertEqual([request_id for _, request_id in self.driver.body_requests], list(self.recording['bodies']))
+        self.assertEqual(responses[0][1]['slug'], 'nancy-pelosi')
+
+    def test_decodes_base64_bodies(self):
+        for body in self.recording['bodies'].values():
+            body['body'] = base64.b64encode(body['body'].encode('utf-8')).decode('ascii')
+            body['base64Encoded'] = True
+        responses = NetworkCapture(self.driver).json_responses()
+        self.assertEqual(len(responses), 2)
+        self.assertEqual(responses[0][1]['slug'], 'nancy-pelosi')
+
+    def test_skips_bodies_chrome_no_longer_has(self):
+        missing = next(iter(self.recording['bodies']))
+        del self.driver.bodies[missing]
+        self.assertEqual(len(NetworkCapture(self.driver).json_responses()), 1)
+
+    def test_without_performance_logging(self):
+        driver = RecordedDriver(self.recording['entries'], self.recording['bodies'], logging_enabled=False)
+        capture = NetworkCapture(driver)
+        self.assertFalse(capture.available)
+        self.assertEqual(capture.json_responses(), [])
+
+    def test_maps_recorded_feeds_onto_portfolio(self):
+        mapped = map_captured_portfolio(NetworkCapture(self.driver).json_responses())
+        self.assertEqual(len(mapped['holdings']), 11)
+        self.assertEqual(len(mapped['recent_trades']), 7)
+        self.assertEqual(len(mapped['historical_performance']), 33)
+
+
+if __name__ == '__main__':
+    unittest.main()
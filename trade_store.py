@@ -0,0 +1,299 @@
+"""
+In-memory trade store indexed by ticker, action and trade date
+Trade and filing dates, disclosure amount ranges and option terms are parsed
+once, at ingest, into numeric columns for aggregation. Ingesting trades updates
+the indexes in place (an append per ticker and action, a binary-search insert
+into each date index) instead of rebuilding them, and duplicate filings are ignored.
+"""
+import base64
+import re
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Seeded filings plus the shapes the scraper's date patterns pick up from the live site
+DATE_FORMATS = ('%m/%d/%Y', '%m/%d/%y', '%m-%d-%Y', '%m-%d-%y', '%Y-%m-%d', '%b %d, %Y', '%b %d %Y')
+
+# '50 call options, strike $150, exp 1/16/2026' / '500 call options exercised, strike $12'
+OPTION_CONTRACTS = re.compile(r'([\d,]+)\s+(call|put)s?\b', re.IGNORECASE)
+OPTION_RIGHT = re.compile(r'\b(call|put)s?\b', re.IGNORECASE)
+OPTION_STRIKE = re.compile(r'strike\s*(?:price\s*)?(?:of\s*)?\$?\s*([\d,]+(?:\.\d+)?)', re.IGNORECASE)
+OPTION_EXPIRY = re.compile(r'\b(?:exp|expiry|expires|expiration)\.?\s*(?:date\s*)?:?\s*([\d/-]+|[A-Z][a-z]{2} \d{1,2}, \d{4})')
+AMOUNT_NUMBER = re.compile(r'\$?\s*([\d,]+(?:\.\d+)?)\s*([KkMm])?')
+
+# (date ordinal, ingestion sequence): unique, sortable position of a trade in a date index
+DateKey = Tuple[int, int]
+
+
+def date_ordinal(value) -> Optional[int]:
+    """Proleptic ordinal of a filing date string, or None if it cannot be parsed"""
+    if not value:
+        return None
+    text = str(value).strip().split('T')[0]
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).toordinal()
+        except ValueError:
+            continue
+    return None
+
+
+def trade_date_ordinal(trade: Dict) -> Optional[int]:
+    return date_ordinal(trade.get('traded_date') or trade.get('date'))
+
+
+# Normalized actions that open or add to a position, and that reduce or close one
+BUY_ACTIONS = ('purchase', 'buy')
+SELL_ACTIONS = ('sale', 'sell', 'sale (full)', 'sale (partial)')
+
+
+def normalize_action(action) -> str:
+    return (action or '').strip().lower()
+
+
+def asset_class(trade: Dict) -> str:
+    """'option' or 'stock': the seeded filings say 'Call Options' where the site may say 'Options'
+    or 'Call', and a row with no type is a stock trade"""
+    kind = (trade.get('type') or '').lower()
+    return 'option' if 'option' in kind or OPTION_RIGHT.search(kind) else 'stock'
+
+
+def parse_amount_range(value) -> Tuple[Optional[float], Optional[float]]:
+    """(low, high) dollars of a disclosure range like '$1,000,001 - $5,000,000'.
+    'Over $50,000,000' gives (50000000, 50000000); unparseable amounts give (None, None)."""
+    if value is None:
+        return None, None
+    if isinstance(value, (int, float)):
+        return float(value), float(value)
+    numbers = []
+    for digits, suffix in AMOUNT_NUMBER.findall(str(value)):
+        number = digits.replace(',', '')
+        if not number:
+            continue
+        amount = float(number)
+        if suffix:
+            amount *= 1000000 if suffix.lower() == 'm' else 1000
+        numbers.append(amount)
+    if not numbers:
+        return None, None
+    return min(numbers), max(numbers)
+
+
+def encode_cursor(key: DateKey) -> str:
+    """Opaque page cursor for a date key"""
+    return base64.urlsafe_b64encode(f"{key[0]}.{key[1]}".encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> DateKey:
+    """Date key from encode_cursor(); raises ValueError for anything else"""
+    try:
+        text = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        ordinal, sequence = text.split('.')
+        return int(ordinal), int(sequence)
+    except Exception:
+        raise ValueError(f"invalid cursor: {cursor!r}")
+
+
+COLUMN_NAMES = ('ticker', 'action', 'type', 'month', 'ordinal', 'filed_ordinal', 'amount_low', 'amount_high', 'amount_mid',
+                'option_right', 'option_contracts', 'option_strike', 'option_expiry', 'option_exercised')
+
+
+def parse_option_terms(trade: Dict) -> Optional[Dict]:
+    """Structured terms of an option trade from its free-text description, or None for non-options.
+    Returns contracts, strike, expiry (date ordinal), right ('call'/'put') and exercised; fields the
+    description does not state are None."""
+    description = trade.get('description') or ''
+    kind = trade.get('type') or ''
+    right = OPTION_RIGHT.search(f"{kind} {description}")
+    if 'option' not in f"{kind} {description}".lower() or not right:
+        return None
+
+    contracts = OPTION_CONTRACTS.search(description)
+    strike = OPTION_STRIKE.search(description)
+    expiry = OPTION_EXPIRY.search(description)
+    return {
+        'contracts': int(contracts.group(1).replace(',', '')) if contracts else None,
+        'strike': float(strike.group(1).replace(',', '')) if strike else None,
+        'expiry': date_ordinal(expiry.group(1)) if expiry else None,
+        'right': right.group(1).lower(),
+        'exercised': 'exercise' in description.lower(),
+    }
+
+
+class DateIndex:
+    """Trades sorted by (trade date ordinal, ingestion sequence)"""
+
+    def __init__(self):
+        self.keys: List[DateKey] = []
+        self.trades: List[Dict] = []
+
+    def copy(self) -> 'DateIndex':
+        index = DateIndex()
+        index.keys = list(self.keys)
+        index.trades = list(self.trades)
+        return index
+
+    def insert(self, key: DateKey, trade: Dict):
+        position = bisect_right(self.keys, key)
+        self.keys.insert(position, key)
+        self.trades.insert(position, trade)
+
+    def window(self, start: Optional[int] = None, end: Optional[int] = None,
+               before: Optional[DateKey] = None) -> Tuple[int, int]:
+        """[lo, hi) positions of trades dated start..end (inclusive) and sorted before the cursor key"""
+        lo = bisect_left(self.keys, (start, -1)) if start is not None else 0
+        hi = bisect_left(self.keys, (end + 1, -1)) if end is not None else len(self.keys)
+        if before is not None:
+            hi = min(hi, bisect_left(self.keys, tuple(before)))
+        return lo, max(lo, hi)
+
+
+class TradeStore:
+    """Trades in ingestion order plus ticker, action and date indexes over them.
+
+    A published store is treated as read-only; copy() gives a new store sharing
+    the trade dicts that the next snapshot can ingest into.
+    """
+
+    def __init__(self, trades: Iterable[Dict] = ()):
+        self._trades: List[Dict] = []
+        self._keys = set()
+        self._by_ticker: Dict[str, List[Dict]] = {}
+        self._by_action: Dict[str, List[Dict]] = {}
+        self._dates = DateIndex()
+        self._filed_dates = DateIndex()
+        self._ticker_dates: Dict[str, DateIndex] = {}
+        self._action_dates: Dict[str, DateIndex] = {}
+        # Numeric columns aligned with _trades, for aggregation (see columns())
+        self._columns: Dict[str, List] = {name: [] for name in COLUMN_NAMES}
+        self.add_many(trades)
+
+    def __len__(self) -> int:
+        return len(self._trades)
+
+    def copy(self) -> 'TradeStore':
+        store = TradeStore()
+        store._trades = list(self._trades)
+        store._keys = set(self._keys)
+        store._by_ticker = {ticker: list(trades) for ticker, trades in self._by_ticker.items()}
+        store._by_action = {action: list(trades) for action, trades in self._by_action.items()}
+        store._dates = self._dates.copy()
+        store._filed_dates = self._filed_dates.copy()
+        store._ticker_dates = {ticker: index.copy() for ticker, index in self._ticker_dates.items()}
+        store._action_dates = {action: index.copy() for action, index in self._action_dates.items()}
+        store._columns = {name: list(values) for name, values in self._columns.items()}
+        return store
+
+    def add(self, trade: Dict) -> bool:
+        """Index one trade; returns False if it was already in the store"""
+        ticker = (trade.get('ticker') or '').strip().upper()
+        action = normalize_action(trade.get('action'))
+        ordinal = trade_date_ordinal(trade)
+        filed = date_ordinal(trade.get('filed_date'))
+        low, high = parse_amount_range(trade.get('amount'))
+        # A disclosed transaction is identified by its parsed fields only; the scraper's
+        # description, type label and filed date differ from the seeded filings for the same
+        # trade. Undated rows carry too little to tell apart, so they are never merged.
+        if ordinal is not None:
+            key = (ticker, action, asset_class(trade), ordinal, low, high)
+            if key in self._keys:
+                return False
+            self._keys.add(key)
+        sequence = len(self._trades)
+        self._trades.append(trade)
+
+        if ticker:
+            self._by_ticker.setdefault(ticker, []).append(trade)
+        if action:
+            self._by_action.setdefault(action, []).append(trade)
+
+        columns = self._columns
+        columns['ticker'].append(ticker)
+        columns['action'].append(action)
+        columns['type'].append((trade.get('type') or '').strip())
+        columns['month'].append(date.fromordinal(ordinal).strftime('%Y-%m') if ordinal is not None else '')
+        columns['ordinal'].append(ordinal if ordinal is not None else -1)
+        columns['filed_ordinal'].append(filed if filed is not None else -1)
+        columns['amount_low'].append(low if low is not None else float('nan'))
+        columns['amount_high'].append(high if high is not None else float('nan'))
+        columns['amount_mid'].append((low + high) / 2 if low is not None else float('nan'))
+        option = parse_option_terms(trade) or {}
+        columns['option_right'].append(option.get('right') or '')
+        columns['option_contracts'].append(option.get('contracts') or 0)
+        columns['option_strike'].append(option['strike'] if option.get('strike') is not None else float('nan'))
+        columns['option_expiry'].append(option['expiry'] if option.get('expiry') is not None else -1)
+        columns['option_exercised'].append(bool(option.get('exercised')))
+
+        if ordinal is not None:
+            date_key = (ordinal, sequence)
+            self._dates.insert(date_key, trade)
+            if ticker:
+                self._ticker_dates.setdefault(ticker, DateIndex()).insert(date_key, trade)
+            if action:
+                self._action_dates.setdefault(action, DateIndex()).insert(date_key, trade)
+        if filed is not None:
+            self._filed_dates.insert((filed, sequence), trade)
+        return True
+
+    def add_many(self, trades: Iterable[Dict]) -> int:
+        """Index new trades; returns how many were not already present"""
+        return sum(1 for trade in trades if self.add(trade))
+
+    def columns(self) -> Dict[str, List]:
+        """Parsed per-trade columns in ingestion order: ticker, action, type, month ('YYYY-MM'),
+        ordinal and filed_ordinal (-1 if undated), amount_low/high/mid (NaN if unparseable) and the option_* terms
+        ('' right / 0 contracts / NaN strike / -1 expiry when absent)"""
+        return self._columns
+
+    def all(self) -> List[Dict]:
+        return list(self._trades)
+
+    def tickers(self) -> List[str]:
+        return list(self._by_ticker)
+
+    def by_ticker(self, ticker: str) -> List[Dict]:
+        return list(self._by_ticker.get(ticker.upper(), ()))
+
+    def by_action(self, action: str) -> List[Dict]:
+        return list(self._by_action.get(normalize_action(action), ()))
+
+    def between(self, start: Optional[int] = None, end: Optional[int] = None) -> List[Dict]:
+        """Trades dated within [start, end] (date ordinals), oldest first"""
+        lo, hi = self._dates.window(start, end)
+        return self._dates.trades[lo:hi]
+
+    def filed_between(self, start: Optional[int] = None, end: Optional[int] = None) -> List[Dict]:
+        """Trades filed within [start, end] (date ordinals), earliest filing first"""
+        lo, hi = self._filed_dates.window(start, end)
+        return self._filed_dates.trades[lo:hi]
+
+    def page(self, start: Optional[int] = None, end: Optional[int] = None, ticker: Optional[str] = None,
+             action: Optional[str] = None, before: Optional[DateKey] = None,
+             limit: int = 50) -> Tuple[List[Dict], Optional[DateKey]]:
+        """Newest-first page of dated trades matching the filters.
+
+        Returns the trades and the date key to pass back as `before` for the next
+        page, or None when there is nothing older.
+        """
+        action = normalize_action(action)
+        if ticker:
+            index = self._ticker_dates.get(ticker.upper())
+        elif action:
+            index = self._action_dates.get(action)
+        else:
+            index = self._dates
+        if index is None:
+            return [], None
+
+        # The ticker index is already the narrowest; only the action still needs checking per row
+        check_action = bool(ticker and action)
+        lo, hi = index.window(start, end, before)
+        trades = []
+        position = hi - 1
+        while position >= lo and len(trades) < limit:
+            trade = index.trades[position]
+            if not check_action or normalize_action(trade.get('action')) == action:
+                trades.append(trade)
+            position -= 1
+        next_key = index.keys[position + 1] if trades and position >= lo else None
+        return trades, next_key